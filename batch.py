@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Correction par lots de transcriptions, sans interface graphique.
+
+Exemple :
+    python batch.py transcriptions/*.txt -o corriges -j 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dictionary_snapshot import load_managers, SNAPSHOT_FILE
+from correction_engine import check_chunks
+from text_stream import iter_text_chunks
+from suggestion_cache import SuggestionCache, CACHE_FILE
+
+# Gestionnaires propres à chaque processus de travail (initialisés une seule fois par processus)
+_spell_manager = None
+_dict_manager = None
+
+
+def init_worker(corrections_file, ignore_file, accent_fold):
+    """Charge le lexique et le dictionnaire personnel dans le processus de travail
+
+    L'instantané compilé est projeté en mémoire : les processus partagent les pages du lexique
+    et de l'index des variantes du dictionnaire personnel, lus directement dans le fichier.
+    Les suggestions sont calculées par le processus parent : l'index SymSpell n'est pas chargé ici.
+    """
+    global _spell_manager, _dict_manager
+    _spell_manager, _dict_manager = load_managers(SNAPSHOT_FILE, corrections_file=corrections_file,
+                                                  ignore_file=ignore_file, accent_fold=accent_fold, read_only=True)
+    _spell_manager.sync_dictionary(_dict_manager)
+
+
+def output_names(paths):
+    """Nom de sortie de chaque fichier, relatif au dossier de sortie : {chemin: nom}
+
+    Le nom du fichier suffit s'il est unique dans le lot ; sinon l'arborescence des fichiers
+    est reproduite à partir de leur dossier commun (a/t.txt et b/t.txt restent distincts).
+    """
+    base_names = [os.path.basename(path) for path in paths]
+    if len(set(base_names)) == len(base_names):
+        return dict(zip(paths, base_names))
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    return {path: os.path.relpath(os.path.abspath(path), root) for path in paths}
+
+
+def output_paths(name, output_dir):
+    """Chemins du texte corrigé et du rapport d'erreurs d'un fichier de nom de sortie name"""
+    stem = os.path.splitext(name)[0]
+    return os.path.join(output_dir, name), os.path.join(output_dir, f"{stem}.erreurs.json")
+
+
+def same_file(first, second):
+    """Indique si deux chemins désignent le même fichier (second peut ne pas exister)"""
+    if os.path.realpath(first) == os.path.realpath(second):
+        return True
+    try:
+        return os.path.samefile(first, second)
+    except OSError:
+        return False
+
+
+def current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+FILE_MODE = 0o666 & ~current_umask()  # Droits d'un fichier créé normalement (mkstemp crée en 0600)
+
+
+@contextmanager
+def atomic_output(path):
+    """Fichier texte écrit dans un fichier temporaire du même dossier, mis en place seulement à la fin
+
+    En cas d'échec, le fichier de sortie précédent (ou son absence) est conservé.
+    """
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f".{name}.", suffix='.tmp')
+    try:
+        with open(fd, 'w', encoding='utf-8') as f:
+            yield f
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def process_file(path, name, output_dir):
+    """Corrige un fichier, écrit le texte corrigé et retourne le résultat à reporter (voir write_report)
+
+    Les sorties sont nommées d'après name (voir output_names), dans output_dir.
+    Le fichier est lu, vérifié et écrit par morceaux : la mémoire utilisée ne dépend pas de sa taille.
+    """
+    start_time = time.perf_counter()
+    output_path, report_path = output_paths(name, output_dir)
+    if same_file(path, output_path) or same_file(path, report_path):
+        raise ValueError(f"la sortie {output_path} remplacerait le fichier lu")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    total_words = 0
+    edits = []  # Positions dans le texte d'origine
+    errors = []  # Positions dans le texte corrigé
+    source_offset = 0
+    output_offset = 0
+    with open(path, 'r', encoding='utf-8') as source, atomic_output(output_path) as output:
+        for result in check_chunks(iter_text_chunks(source), _spell_manager, _dict_manager):
+            output.write(result.text)
+            total_words += result.total_words
+            edits.extend((source_offset + position, old, new) for position, old, new in result.edits)
+            errors.extend((output_offset + start, output_offset + end, word) for start, end, word in result.errors)
+            growth = sum(len(new) - len(old) for _, old, new in result.edits)
+            source_offset += len(result.text) - growth
+            output_offset += len(result.text)
+
+    return {
+        'fichier': path,
+        'sortie': output_path,
+        'rapport': report_path,
+        'mots': total_words,
+        'corrections': edits,
+        'erreurs': errors,
+        'secondes': time.perf_counter() - start_time,
+    }
+
+
+def write_report(result, suggestions):
+    """Écrit le rapport d'erreurs d'un fichier traité par process_file
+
+    suggestions : {mot: [suggestions]} pour les mots en erreur (liste vide si le mot est absent).
+    """
+    report = {
+        'fichier': result['fichier'],
+        'sortie': result['sortie'],
+        'mots': result['mots'],
+        # Positions dans le texte d'origine
+        'corrections': [
+            {'position': position, 'ancien': old, 'nouveau': new}
+            for position, old, new in result['corrections']
+        ],
+        # Positions dans le texte corrigé
+        'erreurs': [
+            {'mot': word, 'debut': start, 'fin': end, 'suggestions': suggestions.get(word, [])}
+            for start, end, word in result['erreurs']
+        ],
+    }
+    with atomic_output(result['rapport']) as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+
+
+def expand_paths(patterns):
+    """Développe les motifs glob (utile sous Windows où le shell ne le fait pas)"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    # Conserver l'ordre en supprimant les doublons
+    return list(dict.fromkeys(paths))
+
+
+def words_per_second(words, seconds):
+    return words / seconds if seconds > 0 else 0.0
+
+
+def positive_int(value):
+    """Type argparse : entier strictement positif"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"un entier au moins égal à 1 est attendu : {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corrige des transcriptions par lots, sans interface graphique")
+    parser.add_argument('fichiers', nargs='+', help="Fichiers ou motifs glob à corriger")
+    parser.add_argument('-o', '--sortie', default='corriges', help="Dossier des fichiers corrigés et des rapports")
+    parser.add_argument('-j', '--processus', type=positive_int, default=os.cpu_count() or 1,
+                        help="Nombre de processus de travail")
+    parser.add_argument('--corrections', default='mots-corrections.txt', help="Dictionnaire personnel")
+    parser.add_argument('--ignore', default='dictionnaire_ignore.txt', help="Liste des mots à ignorer")
+    parser.add_argument('--sans-accents', action='store_true',
+                        help="Reconnaît les variantes du dictionnaire personnel sans tenir compte des accents")
+    parser.add_argument('--cache', default=CACHE_FILE,
+                        help="Cache persistant des suggestions (chaîne vide pour le désactiver)")
+    parser.add_argument('--suggestions', type=int, default=5,
+                        help="Nombre de suggestions par erreur dans le rapport (0 pour aucune)")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.fichiers)
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        print(f"Fichiers introuvables : {', '.join(missing)}", file=sys.stderr)
+        return 1
+    # Une sortie ne doit jamais remplacer un fichier à corriger : il serait vidé avant d'être lu
+    names = output_names(paths)
+    # Même nom sans extension dans un même dossier (t.txt et t.md) : même rapport d'erreurs
+    targets = Counter(target for path in paths for target in output_paths(names[path], args.sortie))
+    duplicates = sorted(target for target, count in targets.items() if count > 1)
+    if duplicates:
+        print(f"Plusieurs fichiers auraient la même sortie : {', '.join(duplicates)}", file=sys.stderr)
+        return 1
+    inputs = [os.path.realpath(path) for path in paths]
+    overwritten = [target for path in paths for target in output_paths(names[path], args.sortie)
+                   if any(same_file(source, target) for source in inputs)]
+    if overwritten:
+        print(f"Les sorties remplaceraient des fichiers à corriger : {', '.join(overwritten)} "
+              f"(choisissez un autre dossier avec -o)", file=sys.stderr)
+        return 1
+    os.makedirs(args.sortie, exist_ok=True)
+
+    total_words = 0
+    failures = 0
+    start_time = time.perf_counter()
+    # Compiler l'instantané une seule fois avant de lancer les processus de travail : ils n'ont plus qu'à le lire
+    suggestion_cache = SuggestionCache(args.cache) if args.cache and args.suggestions > 0 else None
+    spell_manager, dict_manager = load_managers(SNAPSHOT_FILE, corrections_file=args.corrections,
+                                                ignore_file=args.ignore, suggestion_backend='symspell',
+                                                suggestion_cache=suggestion_cache, accent_fold=args.sans_accents,
+                                                read_only=True)
+    spell_manager.sync_dictionary(dict_manager)
+    # Suggestions calculées ici, une fois par mot pour tout le lot : seul ce processus charge l'index SymSpell
+    suggestions = {}
+    try:
+        with ProcessPoolExecutor(max_workers=args.processus, initializer=init_worker,
+                                 initargs=(args.corrections, args.ignore, args.sans_accents)) as executor:
+            futures = {executor.submit(process_file, path, names[path], args.sortie): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                    if args.suggestions > 0:
+                        for word in {word for _, _, word in result['erreurs']} - suggestions.keys():
+                            suggestions[word] = spell_manager.get_suggestions(word, args.suggestions)
+                    write_report(result, suggestions)
+                except Exception as e:
+                    failures += 1
+                    print(f"{path} : échec ({e})", file=sys.stderr)
+                    continue
+                total_words += result['mots']
+                print(f"{path} : {result['mots']} mots, {len(result['erreurs'])} erreurs, "
+                      f"{len(result['corrections'])} corrections automatiques, "
+                      f"{words_per_second(result['mots'], result['secondes']):.0f} mots/s")
+    finally:
+        if suggestion_cache is not None:
+            suggestion_cache.close()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Total : {len(paths) - failures}/{len(paths)} fichiers, {total_words} mots en {elapsed:.2f} s "
+          f"({words_per_second(total_words, elapsed):.0f} mots/s, {args.processus} processus)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
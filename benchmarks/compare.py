@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Compare deux fichiers de résultats de run_benchmarks.py et signale les régressions.
+
+Exemple :
+    python benchmarks/compare.py avant.json apres.json --seuil 0.1
+"""
+
+import argparse
+import json
+import sys
+
+
+def flatten(results):
+    """Retourne {(section, étape): secondes} pour toutes les mesures d'un fichier de résultats"""
+    durations = {}
+    for name, entry in results.get('chargement', {}).items():
+        durations[('chargement', name)] = entry['secondes']
+    for size, size_results in results.get('tailles', {}).items():
+        for name, entry in size_results['etapes'].items():
+            durations[(f"{size} mots", name)] = entry['secondes']
+    return durations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare deux mesures de performances")
+    parser.add_argument('reference', help="Résultats de référence (JSON)")
+    parser.add_argument('nouveau', help="Nouveaux résultats (JSON)")
+    parser.add_argument('--seuil', type=float, default=0.10,
+                        help="Ralentissement relatif au-delà duquel une étape est signalée (0.10 = 10 %%)")
+    args = parser.parse_args(argv)
+
+    with open(args.reference, encoding='utf-8') as f:
+        reference = json.load(f)
+    with open(args.nouveau, encoding='utf-8') as f:
+        new = json.load(f)
+    print(f"Référence : {reference.get('commit')} ({reference.get('date')})")
+    print(f"Nouveau   : {new.get('commit')} ({new.get('date')})")
+
+    old_durations = flatten(reference)
+    new_durations = flatten(new)
+    regressions = 0
+    for key in sorted(old_durations.keys() & new_durations.keys()):
+        before, after = old_durations[key], new_durations[key]
+        ratio = after / before if before > 0 else float('inf')
+        flag = ""
+        if ratio > 1 + args.seuil:
+            flag = "  RÉGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.seuil:
+            flag = "  amélioration"
+        section, name = key
+        print(f"{section:<12} {name:<40} {before * 1000:10.1f} ms -> {after * 1000:10.1f} ms  x{ratio:.2f}{flag}")
+    for key in sorted(new_durations.keys() - old_durations.keys()):
+        print(f"{key[0]:<12} {key[1]:<40} (nouvelle mesure)")
+    print(f"{regressions} régression(s) au-delà de {args.seuil:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Génération de transcriptions françaises synthétiques et reproductibles pour les mesures de performance
+
+Le vocabulaire est tiré des mots les plus fréquents du lexique (pyspellchecker) ; une graine
+donnée produit toujours le même texte et le même dictionnaire personnel.
+"""
+
+import random
+
+SYLLABLES = ("ba", "da", "el", "fa", "ha", "ka", "li", "ma", "na", "ou", "ra", "sa", "ta", "za",
+             "bi", "di", "hi", "ki", "mi", "ni", "ri", "si", "ti", "al", "am", "ar", "is", "ul")
+LETTERS = "abcdefghijklmnopqrstuvwxyzéèàç"
+
+
+def common_words(lexicon, count=5000):
+    """Retourne les count mots alphabétiques les plus fréquents du lexique, avec leur fréquence"""
+    words = sorted(((word, frequency) for word, frequency in lexicon.items()
+                    if word.isalpha() and len(word) > 1), key=lambda item: (-item[1], item[0]))
+    return words[:count]
+
+
+def misspell(word, rng, lexicon):
+    """Déforme un mot (lettre remplacée, doublée ou supprimée) jusqu'à obtenir un mot absent du lexique"""
+    for _ in range(20):
+        position = rng.randrange(len(word))
+        operation = rng.randrange(3)
+        if operation == 0:
+            candidate = word[:position] + rng.choice(LETTERS) + word[position + 1:]
+        elif operation == 1:
+            candidate = word[:position] + word[position] + word[position:]
+        else:
+            candidate = word[:position] + word[position + 1:]
+        if len(candidate) > 2 and candidate.lower() not in lexicon:
+            return candidate
+    return word + "xq"
+
+
+def invented_name(rng, syllables):
+    """Nom propre inventé (absent du lexique en pratique)"""
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def generate_corrections(entry_count, variants_per_entry, seed=0, multi_word_ratio=0.2):
+    """Génère un dictionnaire personnel {correction: [variantes]}
+
+    Chaque correction est un nom inventé (une part en deux mots) accompagné de
+    variants_per_entry variantes déformées.
+    """
+    rng = random.Random(seed)
+    corrections = {}
+    while len(corrections) < entry_count:
+        correction = invented_name(rng, rng.randint(2, 4))
+        if rng.random() < multi_word_ratio:
+            correction = f"{correction} {invented_name(rng, rng.randint(2, 3))}"
+        if correction in corrections:
+            continue
+        variants = set()
+        while len(variants) < variants_per_entry:
+            variant = misspell(correction, rng, ())
+            if variant != correction and ":" not in variant and "," not in variant:
+                variants.add(variant)
+        corrections[correction] = sorted(variants)
+    return corrections
+
+
+def write_corrections(corrections, filename):
+    """Écrit un dictionnaire personnel au format de mots-corrections.txt"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for correction, variants in sorted(corrections.items()):
+            f.write(f"{correction}:{','.join(variants)}\n")
+
+
+def generate_transcript(word_count, vocabulary, lexicon, corrections, error_rate=0.03,
+                        variant_density=0.01, seed=0):
+    """Génère une transcription de word_count mots environ
+
+    error_rate est la proportion de mots déformés (absents du lexique), variant_density
+    celle des variantes du dictionnaire personnel insérées à la place d'un mot du vocabulaire.
+    Les phrases se terminent par ". " et sont regroupées en paragraphes, comme dans les transcriptions.
+    """
+    rng = random.Random(seed)
+    words = [word for word, _ in vocabulary]
+    weights = [frequency for _, frequency in vocabulary]
+    variants = [variant for entry in corrections.values() for variant in entry]
+    paragraphs = []
+    sentences = []
+    sentence = []
+    sentence_length = rng.randint(6, 20)
+    produced = 0
+    while produced < word_count:
+        # Tirage par blocs : random.choices est bien plus rapide que des tirages un à un
+        for word in rng.choices(words, weights, k=min(1000, word_count - produced)):
+            draw = rng.random()
+            if draw < error_rate:
+                word = misspell(word, rng, lexicon)
+            elif variants and draw < error_rate + variant_density:
+                word = rng.choice(variants)
+            if not sentence:
+                word = word[0].upper() + word[1:]
+            sentence.append(word)
+            produced += 1
+            if len(sentence) >= sentence_length:
+                sentences.append(" ".join(sentence) + ".")
+                sentence = []
+                sentence_length = rng.randint(6, 20)
+                if len(sentences) >= rng.randint(2, 6):
+                    paragraphs.append(" ".join(sentences))
+                    sentences = []
+    if sentence:
+        sentences.append(" ".join(sentence) + ".")
+    if sentences:
+        paragraphs.append(" ".join(sentences))
+    return "\n".join(paragraphs) + "\n"
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Mesure la durée de chaque étape de la correction sur des transcriptions synthétiques, sans interface.
+
+Exemple :
+    python benchmarks/run_benchmarks.py --tailles 1000 100000 -o avant.json
+    python benchmarks/compare.py avant.json apres.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import common_words, generate_corrections, generate_transcript, write_corrections  # noqa: E402
+from dictionary_manager import DictionaryManager  # noqa: E402
+from dictionary_snapshot import load_managers  # noqa: E402
+from correction_engine import rewrite_text, check_text  # noqa: E402
+from parallel_check import ParallelChecker  # noqa: E402
+
+FORMAT_VERSION = 1
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+
+
+def measure(function, repeats):
+    """Exécute function repeats fois, retourne (meilleure durée en secondes, dernier résultat)"""
+    best = None
+    result = None
+    for _ in range(max(repeats, 1)):
+        start_time = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def stage(seconds, items=None, unit='mots'):
+    """Résultat d'une étape : durée et débit éventuel"""
+    entry = {'secondes': round(seconds, 6)}
+    if items is not None:
+        entry[unit] = items
+        entry[f'{unit}_par_seconde'] = round(items / seconds, 1) if seconds > 0 else None
+    return entry
+
+
+def current_commit():
+    """Retourne l'identifiant du commit courant, ou None hors d'un dépôt git"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def personal_lookup(dict_manager, text, tokens):
+    """Recherche des variantes du dictionnaire personnel : multi-mots dans le texte, puis mot à mot"""
+    phrases = dict_manager.find_phrases(text)
+    for word in tokens.words:
+        dict_manager.find_correction(word)
+    return phrases
+
+
+def check_words(spell_manager, words):
+    """Verdicts de chaque mot distinct, cache vide"""
+    spell_manager.clear_cache()
+    return [word for word in words if not spell_manager.check_word(word)]
+
+
+def benchmark_size(word_count, args, spell_manager, dict_manager, vocabulary, corrections, parallel_checker=None):
+    """Mesure chaque étape sur une transcription de word_count mots"""
+    text = generate_transcript(word_count, vocabulary, spell_manager.lexicon, corrections,
+                               args.taux_erreurs, args.densite_variantes, args.graine + word_count)
+    repeats = args.repetitions
+    stages = {}
+
+    seconds, tokens = measure(lambda: spell_manager.tokenize(text), repeats)
+    words = len(tokens)
+    stages['tokenisation'] = stage(seconds, words)
+
+    seconds, phrases = measure(lambda: personal_lookup(dict_manager, text, tokens), repeats)
+    stages['dictionnaire personnel'] = stage(seconds, words)
+
+    seconds, misspelled = measure(lambda: check_words(spell_manager, tokens.words), repeats)
+    stages['check_word'] = stage(seconds, len(tokens.words), 'mots_distincts')
+
+    seconds, _ = measure(lambda: rewrite_text(text, phrases), repeats)
+    stages['réécriture'] = stage(seconds, len(phrases), 'variantes')
+
+    def full_check():
+        spell_manager.clear_cache()
+        return check_text(text, spell_manager, dict_manager)
+    seconds, result = measure(full_check, repeats)
+    stages['vérification complète'] = stage(seconds, words)
+
+    if parallel_checker is not None:
+        seconds, _ = measure(lambda: parallel_checker.check(text, dict_manager), repeats)
+        stages['vérification parallèle'] = stage(seconds, words)
+
+    sample = misspelled[:args.suggestions]
+    if sample:
+        seconds, _ = measure(lambda: [spell_manager.get_suggestions(word, 10) for word in sample], 1)
+        stages['get_suggestions'] = stage(seconds, len(sample), 'mots_distincts')
+
+    return {
+        'mots': words,
+        'caracteres': len(text),
+        'mots_distincts': len(tokens.words),
+        'erreurs': len(result.errors),
+        'corrections_automatiques': len(result.edits),
+        'etapes': stages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure les performances de la chaîne de correction")
+    parser.add_argument('--tailles', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Nombres de mots des transcriptions générées")
+    parser.add_argument('--taux-erreurs', type=float, default=0.03, help="Proportion de mots mal orthographiés")
+    parser.add_argument('--densite-variantes', type=float, default=0.01,
+                        help="Proportion de variantes du dictionnaire personnel dans le texte")
+    parser.add_argument('--entrees', type=int, default=2000, help="Nombre d'entrées du dictionnaire personnel")
+    parser.add_argument('--variantes-par-entree', type=int, default=4, help="Variantes par entrée du dictionnaire")
+    parser.add_argument('--suggestions', type=int, default=200,
+                        help="Nombre de mots erronés distincts dont les suggestions sont calculées")
+    parser.add_argument('--repetitions', type=int, default=3, help="Répétitions de chaque mesure (la meilleure est gardée)")
+    parser.add_argument('--processus', type=int, default=0,
+                        help="Nombre de processus de la vérification parallèle (0 : pas de mesure)")
+    parser.add_argument('--graine', type=int, default=42, help="Graine du générateur")
+    parser.add_argument('-o', '--sortie', help="Fichier JSON des résultats (par défaut benchmarks/resultats/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    output = args.sortie or os.path.join(ROOT, 'benchmarks', 'resultats', f"{commit or 'sans-commit'}.json")
+    results = {
+        'version': FORMAT_VERSION,
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plateforme': platform.platform(),
+        'parametres': {key: value for key, value in vars(args).items() if key != 'sortie'},
+        'chargement': {},
+        'tailles': {},
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        corrections = generate_corrections(args.entrees, args.variantes_par_entree, args.graine)
+        corrections_file = os.path.join(directory, 'mots-corrections.txt')
+        write_corrections(corrections, corrections_file)
+
+        # Instantané construit dans le dossier temporaire : la première mesure part des sources
+        timings = {}
+        spell_manager, dict_manager = load_managers(
+            os.path.join(directory, 'dictionnaires.snapshot'), corrections_file=corrections_file,
+            ignore_file=os.path.join(ROOT, 'dictionnaire_ignore.txt'), timings=timings,
+            suggestion_backend='symspell', symspell_file=os.path.join(ROOT, 'index_suggestions.pickle'))
+        loading = results['chargement']
+        loading['lexique (construction de l\'instantané)'] = stage(timings['lexique'])
+        loading['dictionnaire personnel (construction de l\'instantané)'] = stage(
+            timings['instantané du dictionnaire personnel'])
+        seconds, _ = measure(lambda: load_managers(
+            os.path.join(directory, 'dictionnaires.snapshot'), corrections_file=corrections_file,
+            ignore_file=os.path.join(ROOT, 'dictionnaire_ignore.txt')), args.repetitions)
+        loading['lexique et dictionnaire (instantané)'] = stage(seconds)
+        seconds, _ = measure(lambda: load_managers(
+            os.path.join(directory, 'dictionnaires.snapshot'), corrections_file=corrections_file,
+            ignore_file=os.path.join(ROOT, 'dictionnaire_ignore.txt'), read_only=True), args.repetitions)
+        loading['lexique et dictionnaire (lecture seule)'] = stage(seconds)
+
+        entry_count = dict_manager.get_correction_count()
+        seconds, _ = measure(lambda: DictionaryManager().load_custom_corrections(corrections_file), args.repetitions)
+        loading['chargement du dictionnaire personnel'] = stage(seconds, entry_count, 'entrees')
+        saved_file = os.path.join(directory, 'sauvegarde.txt')
+        seconds, _ = measure(lambda: dict_manager.save_custom_corrections(dict_manager.corrections_perso, saved_file),
+                             args.repetitions)
+        loading['sauvegarde du dictionnaire personnel'] = stage(seconds, entry_count, 'entrees')
+        # Index chargé et complété par le dictionnaire personnel avant les mesures de get_suggestions
+        spell_manager.sync_dictionary(dict_manager)
+        seconds, _ = measure(spell_manager.get_symspell_index, 1)
+        loading['index des suggestions'] = stage(seconds)
+
+        parallel_checker = None
+        if args.processus:
+            parallel_checker = ParallelChecker(
+                args.processus, os.path.join(directory, 'dictionnaires.snapshot'), corrections_file=corrections_file,
+                ignore_file=os.path.join(ROOT, 'dictionnaire_ignore.txt'))
+            # Démarrage des processus (lecture de l'instantané) mesuré à part
+            seconds, _ = measure(lambda: parallel_checker.check("\n", dict_manager), 1)
+            loading['démarrage des processus'] = stage(seconds)
+
+        vocabulary = common_words(spell_manager.lexicon)
+        try:
+            for word_count in args.tailles:
+                print(f"{word_count} mots...", flush=True)
+                size_results = benchmark_size(word_count, args, spell_manager, dict_manager, vocabulary, corrections,
+                                              parallel_checker)
+                results['tailles'][str(word_count)] = size_results
+                for name, entry in size_results['etapes'].items():
+                    print(f"  {name:<25} {entry['secondes'] * 1000:10.1f} ms")
+        finally:
+            if parallel_checker is not None:
+                parallel_checker.close()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Résultats enregistrés dans {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
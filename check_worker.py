@@ -0,0 +1,197 @@
+import queue
+import threading
+import time
+import os
+from correction_engine import CheckCancelled, rewrite_text, find_errors, line_starts, to_line_col, check_chunks
+from text_stream import CHUNK_SIZE, iter_text_chunks
+from instrumentation import Instrumentation
+
+
+class SpellCheckWorker:
+    """Exécute une vérification orthographique dans un thread séparé
+
+    Les résultats sont déposés dans une file d'attente lue par le thread Tk :
+    ('texte', texte_corrigé, corrections, nb_mots, nb_lignes), ('erreurs', [(ligne, colonne_début, colonne_fin, mot)]),
+    ('progression', mots_traités, nb_mots), ('fin', résumé des niveaux) ou ('echec', exception).
+    La durée de chaque phase est relevée par instrumentation, si elle est activée.
+    Un texte assez long est découpé et vérifié par plusieurs processus (parallel_checker,
+    voir parallel_check.ParallelChecker), avec les mêmes messages et les mêmes résultats.
+    """
+    ERROR_CONTEXT = "la vérification"  # Pour le message d'erreur affiché par l'interface
+    
+    def __init__(self, text, spell_manager, dict_manager, progress_interval=0.1, batch_size=500,
+                 instrumentation=None, parallel_checker=None):
+        self.text = text
+        self.parallel_checker = parallel_checker
+        self.spell_manager = spell_manager
+        self.dict_manager = dict_manager
+        self.progress_interval = progress_interval  # Au plus une mise à jour de progression par intervalle
+        self.batch_size = batch_size
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self._last_progress = 0.0
+
+    def start(self):
+        """Démarre la vérification"""
+        self.thread.start()
+
+    def cancel(self):
+        """Demande l'arrêt de la vérification"""
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _run(self):
+        try:
+            with self.instrumentation.profiled():
+                if self.parallel_checker is not None and self.parallel_checker.worthwhile(self.text):
+                    self._run_parallel()
+                else:
+                    self._run_serial()
+            self._check_cancelled()
+            self.queue.put(('fin', self.spell_manager.format_tier_counts()))
+        except CheckCancelled:
+            pass
+        except Exception as e:
+            self.queue.put(('echec', e))
+
+    def _run_serial(self):
+        """Vérifie le texte dans ce thread, en envoyant les erreurs par lots au fil de la vérification"""
+        instrumentation = self.instrumentation
+        with instrumentation.phase('tokenisation') as phase:
+            tokens = self.spell_manager.tokenize(self.text)
+            phase.add(len(tokens))
+        self._check_cancelled()
+        with instrumentation.phase('dictionnaire personnel') as phase:
+            phrases = self.dict_manager.find_phrases(self.text)
+            phase.add(len(phrases))
+        self._check_cancelled()
+        with instrumentation.phase('réécriture') as phase:
+            new_text, edits = rewrite_text(self.text, phrases)
+            starts = line_starts(new_text)
+            phase.add(len(edits))
+        self.queue.put(('texte', new_text, edits, len(tokens), len(starts)))
+
+        self.spell_manager.tier_counts.clear()
+        with instrumentation.phase('check_word') as phase:
+            batch = []
+            for start, end, word in find_errors(tokens, edits, self.spell_manager, self.dict_manager,
+                                                self._on_progress, phrases=phrases):
+                line, column = to_line_col(starts, start)
+                batch.append((line, column, column + end - start, word))
+                if len(batch) >= self.batch_size:
+                    self.queue.put(('erreurs', batch))
+                    batch = []
+            if batch:
+                self.queue.put(('erreurs', batch))
+            phase.add(len(tokens))
+
+    def _run_parallel(self):
+        """Vérifie le texte découpé entre plusieurs processus et envoie les erreurs une fois tous les morceaux vérifiés"""
+        self.spell_manager.tier_counts.clear()
+        with self.instrumentation.phase('vérification parallèle') as phase:
+            result = self.parallel_checker.check(self.text, self.dict_manager, self.spell_manager.tier_counts,
+                                                 self._on_progress, self.is_cancelled)
+            phase.add(result.total_words)
+        starts = line_starts(result.text)
+        self.queue.put(('texte', result.text, result.edits, result.total_words, len(starts)))
+        for first in range(0, len(result.errors), self.batch_size):
+            batch = []
+            for start, end, word in result.errors[first:first + self.batch_size]:
+                line, column = to_line_col(starts, start)
+                batch.append((line, column, column + end - start, word))
+            self.queue.put(('erreurs', batch))
+
+    def _check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise CheckCancelled()
+
+    def _on_progress(self, done, total):
+        self._check_cancelled()
+        now = time.monotonic()
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.queue.put(('progression', done, total))
+
+
+class FileCheckWorker(SpellCheckWorker):
+    """Charge un fichier par morceaux dans un thread séparé et vérifie chaque morceau dès sa lecture
+
+    Messages : ('morceau', texte_corrigé, nb_corrections, nb_retours_à_la_ligne),
+    ('erreurs', [(ligne, colonne_début, colonne_fin, mot)]) avec les lignes du document entier,
+    ('lecture', octets_lus, taille_du_fichier), ('fin', résumé des niveaux) ou ('echec', exception).
+    La file d'attente est bornée : la lecture attend que l'interface ait inséré les morceaux
+    précédents, et la mémoire utilisée dépend de la taille des morceaux, pas de celle du fichier.
+    Sans spell_manager, le fichier est seulement chargé.
+    """
+    ERROR_CONTEXT = "l'ouverture du fichier"
+    
+    def __init__(self, path, spell_manager, dict_manager, chunk_size=CHUNK_SIZE, reformat=True,
+                 max_pending=8, batch_size=500, instrumentation=None):
+        super().__init__(None, spell_manager, dict_manager, batch_size=batch_size, instrumentation=instrumentation)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.reformat = reformat
+        self.queue = queue.Queue(maxsize=max_pending)
+
+    def _put(self, message):
+        """Dépose un message en attendant une place dans la file, sauf si la vérification est annulée"""
+        while True:
+            self._check_cancelled()
+            try:
+                self.queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _timed_chunks(self, chunks):
+        """Relève la durée de lecture de chaque morceau (phase 'lecture du texte')"""
+        chunks = iter(chunks)
+        while True:
+            with self.instrumentation.phase('lecture du texte') as phase:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    phase.add(len(chunk))
+            if chunk is None:
+                return
+            yield chunk
+
+    def _run(self):
+        try:
+            total_bytes = os.path.getsize(self.path)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                chunks = iter_text_chunks(f, self.chunk_size, self.reformat)
+                if self.spell_manager is None:
+                    for chunk in chunks:
+                        self._put(('morceau', chunk, 0, chunk.count("\n")))
+                        self._put(('lecture', f.buffer.tell(), total_bytes))
+                    self._put(('fin', ""))
+                    return
+                line_offset = 0  # Nombre de lignes des morceaux précédents
+                with self.instrumentation.profiled():
+                    for result in check_chunks(self._timed_chunks(chunks), self.spell_manager, self.dict_manager,
+                                               lambda done, total: self._check_cancelled(), self.instrumentation):
+                        starts = line_starts(result.text)
+                        self._put(('morceau', result.text, len(result.edits), len(starts) - 1))
+                        batch = []
+                        for start, end, word in result.errors:
+                            line, column = to_line_col(starts, start)
+                            batch.append((line_offset + line, column, column + end - start, word))
+                            if len(batch) >= self.batch_size:
+                                self._put(('erreurs', batch))
+                                batch = []
+                        if batch:
+                            self._put(('erreurs', batch))
+                        self._put(('lecture', f.buffer.tell(), total_bytes))
+                        line_offset += len(starts) - 1
+            self._put(('fin', self.spell_manager.format_tier_counts()))
+        except CheckCancelled:
+            pass
+        except Exception as e:
+            try:
+                self._put(('echec', e))
+            except CheckCancelled:
+                pass
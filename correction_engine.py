@@ -0,0 +1,154 @@
+import bisect
+from instrumentation import Instrumentation
+
+
+class CheckCancelled(Exception):
+    """Levée pour interrompre une vérification en cours"""
+
+
+class CheckResult:
+    """Résultat d'une vérification : texte corrigé, corrections appliquées et erreurs restantes"""
+    def __init__(self, text, edits, errors, total_words):
+        self.text = text  # Texte après corrections automatiques
+        self.edits = edits  # [(position dans le texte d'origine, ancien mot, nouveau mot)]
+        self.errors = errors  # [(début, fin, mot)] positions dans le texte corrigé
+        self.total_words = total_words
+
+    def misspelled(self):
+        """Retourne l'ensemble des mots mal orthographiés"""
+        return {word for _, _, word in self.errors}
+
+
+def line_starts(text):
+    """Retourne la position du début de chaque ligne du texte"""
+    starts = [0]
+    position = text.find("\n")
+    while position != -1:
+        starts.append(position + 1)
+        position = text.find("\n", position + 1)
+    return starts
+
+
+def to_line_col(starts, offset):
+    """Convertit une position dans le texte en (ligne, colonne) au format du widget Text"""
+    line = bisect.bisect_right(starts, offset)
+    return line, offset - starts[line - 1]
+
+
+def match_case(source, correction):
+    """Adapte la casse de la correction à celle du mot d'origine"""
+    if len(source) > 1 and source.isupper():
+        return correction.upper()
+    if source[0].isupper():
+        return correction[0].upper() + correction[1:]
+    return correction.lower()
+
+
+def rewrite_text(text, phrases):
+    """Applique les corrections du dictionnaire personnel en une seule passe sur le texte
+
+    phrases est la liste triée, sans chevauchement, des variantes trouvées (début, fin, correction).
+    Retourne le texte corrigé et la liste des corrections (position, ancien, nouveau).
+    """
+    pieces = []
+    edits = []
+    last = 0
+    for start, end, correct_word in phrases:
+        word = text[start:end]
+        replacement = match_case(word, correct_word)
+        if replacement == word:
+            continue
+        pieces.append(text[last:start])
+        pieces.append(replacement)
+        edits.append((start, word, replacement))
+        last = end
+    if not edits:
+        return text, edits
+    pieces.append(text[last:])
+    return "".join(pieces), edits
+
+
+def find_errors(tokens, edits, spell_manager, dict_manager, progress=None, progress_step=200, phrases=()):
+    """Génère les erreurs (début, fin, mot) avec leurs positions dans le texte corrigé
+
+    tokens est la table des mots du texte d'origine (voir TokenTable). Chaque mot
+    distinct n'est vérifié qu'une fois par passe ; les verdicts sont ensuite reportés
+    sur toutes ses occurrences. Les mots compris dans une variante du dictionnaire
+    (phrases) ne sont pas vérifiés.
+    """
+    spell_manager.sync_dictionary(dict_manager)
+    words = tokens.words
+    tiers = [None] * len(words)  # Niveau de vérification qui a résolu chaque mot distinct
+    total_words = len(tokens)
+    delta = 0  # Décalage introduit par les corrections précédentes
+    edit_index = 0
+    phrase_index = 0
+    for i, (start, end, type_id) in enumerate(zip(tokens.starts, tokens.ends, tokens.types)):
+        if progress is not None and i % progress_step == 0:
+            progress(i, total_words)
+        while phrase_index < len(phrases) and phrases[phrase_index][1] <= start:
+            phrase_index += 1
+        if phrase_index < len(phrases) and phrases[phrase_index][0] <= start and end <= phrases[phrase_index][1]:
+            spell_manager.tier_counts['variante'] += 1
+            continue
+        word = words[type_id]
+        tier = tiers[type_id]
+        if tier is None:
+            if dict_manager.find_correction(word) is not None:
+                tier = 'variante'
+            else:
+                tier = spell_manager.classify_word(word)
+            tiers[type_id] = tier
+        spell_manager.tier_counts[tier] += 1
+        if tier != 'inconnu':
+            continue
+        while edit_index < len(edits) and edits[edit_index][0] < start:
+            _, old, new = edits[edit_index]
+            delta += len(new) - len(old)
+            edit_index += 1
+        yield start + delta, end + delta, word
+    if progress is not None:
+        progress(total_words, total_words)
+
+
+def check_line(line_text, spell_manager, dict_manager):
+    """Vérifie une seule ligne sans la corriger, retourne [(colonne_début, colonne_fin, mot)]"""
+    tokens = spell_manager.tokenize(line_text)
+    phrases = dict_manager.find_phrases(line_text)
+    return list(find_errors(tokens, [], spell_manager, dict_manager, phrases=phrases))
+
+
+def check_text(text, spell_manager, dict_manager, progress=None):
+    """Vérifie un texte sans interface : corrections automatiques puis recherche des erreurs"""
+    tokens = spell_manager.tokenize(text)
+    phrases = dict_manager.find_phrases(text)
+    new_text, edits = rewrite_text(text, phrases)
+    spell_manager.tier_counts.clear()
+    errors = list(find_errors(tokens, edits, spell_manager, dict_manager, progress, phrases=phrases))
+    return CheckResult(new_text, edits, errors, len(tokens))
+
+
+def check_chunks(chunks, spell_manager, dict_manager, progress=None, instrumentation=None):
+    """Vérifie un texte découpé en morceaux (voir text_stream.iter_text_chunks), morceau par morceau
+
+    Produit un CheckResult par morceau, dont les positions sont relatives au morceau :
+    la mémoire utilisée dépend de la taille des morceaux, pas de celle du texte.
+    La durée de chaque phase est relevée par instrumentation, si elle est activée.
+    """
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    spell_manager.tier_counts.clear()
+    for chunk in chunks:
+        with instrumentation.phase('tokenisation') as phase:
+            tokens = spell_manager.tokenize(chunk)
+            phase.add(len(tokens))
+        with instrumentation.phase('dictionnaire personnel') as phase:
+            phrases = dict_manager.find_phrases(chunk)
+            phase.add(len(phrases))
+        with instrumentation.phase('réécriture') as phase:
+            new_text, edits = rewrite_text(chunk, phrases)
+            phase.add(len(edits))
+        with instrumentation.phase('check_word') as phase:
+            errors = list(find_errors(tokens, edits, spell_manager, dict_manager, progress, phrases=phrases))
+            phase.add(len(tokens))
+        yield CheckResult(new_text, edits, errors, len(tokens))
@@ -1,50 +1,319 @@
+import json
+import os
+import threading
+from phrase_matcher import PhraseMatcher, ACCENT_TABLE
+
+
 class DictionaryManager:
-    def __init__(self):
-        self.corrections_perso = {}  # Format: {mot_correct: set(variantes)}
+    COMPACT_THRESHOLD = 500  # Opérations journalisées avant la réécriture du fichier trié en arrière-plan
+    
+    def __init__(self, accent_fold=False):
+        # Les variantes ne sont conservées que sous leur forme normalisée (minuscules, et sans
+        # accents si accent_fold) : la casse d'origine est reprise du texte lors de la correction
+        self.accent_fold = accent_fold
+        self.corrections_perso = {}  # Format: {mot_correct: set(variantes_normalisées)}
+        self.variant_index = {}  # Format: {variante_normalisée: mot_correct}
+        self.conflicts = {}  # Format: {variante_normalisée: [mots_corrects]} (le premier l'emporte)
+        # Recherche de toutes les variantes (y compris multi-mots) dans un texte
+        self.phrase_matcher = PhraseMatcher(fold_accents=accent_fold)
+        self.version = 0  # Incrémentée à chaque modification (invalidation des caches)
         self.dict_file = "dictionnaire_perso.json"
         
+        # Journal des modifications : chaque modification est ajoutée à la fin du journal,
+        # le fichier trié n'est réécrit que lors du compactage (voir compact)
+        self.corrections_file = None  # Fichier trié associé (journal désactivé si None)
+        self.journal = None
+        self.journal_entries = 0
+        self.journal_lock = threading.Lock()
+        self.compaction_thread = None
+        self.replaying = False
+        self.pending_changes = None  # Corrections modifiées depuis take_changes (None : toutes)
+        
+    def normalize_variant(self, variante):
+        """Retourne la forme normalisée d'une variante, clé de l'index et du stockage"""
+        cle = variante.strip().lower()
+        return cle.translate(ACCENT_TABLE) if self.accent_fold else cle
+
+    def _variant_keys(self, correction, variantes):
+        """Formes normalisées des variantes d'une correction, sans doublons ni la correction elle-même"""
+        cles = {self.normalize_variant(variante) for variante in variantes}
+        cles.discard("")
+        cles.discard(self.normalize_variant(correction))
+        return cles
+
     def load_custom_corrections(self, filename='mots-corrections.txt'):
-        """Charge le dictionnaire de corrections personnalisées"""
+        """Charge le dictionnaire de corrections personnalisées et reconstruit l'index des variantes"""
         try:
             corrections = {}
             with open(filename, 'r', encoding='utf-8') as f:
                 for ligne in f:
                     if ':' in ligne:
-                        mot_correct, variantes = ligne.strip().split(':')
+                        mot_correct, variantes = ligne.strip().split(':', 1)
                         mot_correct = mot_correct.strip()
-                        # Stocker le mot correct en minuscules et majuscules
-                        if mot_correct not in corrections:
-                            corrections[mot_correct] = set()
-                            # Ajouter aussi la version avec majuscule
-                            corrections[mot_correct].add(mot_correct)
-                            corrections[mot_correct].add(mot_correct.capitalize())
-                        if variantes:
-                            for variante in variantes.split(','):
-                                variante = variante.strip()
-                                corrections[mot_correct].add(variante.lower())
-                                corrections[mot_correct].add(variante.capitalize())
-            return corrections
+                        # L'ancien format (chaque variante en minuscules et avec majuscule, mot
+                        # correct compris) se réduit aux mêmes formes normalisées
+                        cles = self._variant_keys(mot_correct, variantes.split(',') if variantes else ())
+                        corrections.setdefault(mot_correct, set()).update(cles)
         except FileNotFoundError:
-            return {}
-            
+            corrections = {}
+        self.corrections_perso = corrections
+        self.rebuild_index()
+        self.replay_journal(filename)
+        self.corrections_file = filename
+        self.pending_changes = None
+        self.version += 1
+        return corrections
+
     def save_custom_corrections(self, corrections, filename='mots-corrections.txt'):
-        """Sauvegarde le dictionnaire de corrections personnalisées"""
-        with open(filename, 'w', encoding='utf-8') as f:
+        """Sauvegarde le dictionnaire de corrections personnalisées (écriture atomique)
+
+        Chaque variante n'est écrite qu'une fois, sous sa forme normalisée.
+        """
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
             for correction, variantes in sorted(corrections.items()):
                 variantes_str = ",".join(sorted(variantes))
                 f.write(f"{correction}:{variantes_str}\n")
-                
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, filename)
+        
+    @staticmethod
+    def journal_paths(filename):
+        """Retourne les journaux d'un fichier de corrections, du plus ancien au plus récent :
+        celui en cours de compactage, puis celui en cours d'écriture"""
+        return [f"{filename}.journal.compactage", f"{filename}.journal"]
+
+    def replay_journal(self, filename, offsets=None):
+        """Rejoue sur le dictionnaire chargé les modifications journalisées depuis le dernier compactage
+
+        offsets donne, pour chaque journal, la position (en octets) des premières modifications
+        à rejouer : celles qui précèdent sont déjà dans le dictionnaire (instantané compilé).
+        """
+        self.journal_entries = 0
+        self.replaying = True
+        try:
+            for index, path in enumerate(self.journal_paths(filename)):
+                try:
+                    with open(path, 'rb') as f:
+                        if offsets:
+                            f.seek(offsets[index])
+                        for ligne in f:
+                            try:
+                                operation = json.loads(ligne)
+                            except ValueError:
+                                # Dernière ligne incomplète (arrêt pendant l'écriture) : ignorée
+                                print(f"Journal {path} : ligne illisible ignorée")
+                                break
+                            self._apply_operation(operation)
+                            self.journal_entries += 1
+                except FileNotFoundError:
+                    pass
+        finally:
+            self.replaying = False
+
+    def _apply_operation(self, operation):
+        """Applique une opération du journal"""
+        kind = operation['op']
+        if kind == 'ajout':
+            self.add_correction(operation['correction'], operation['variante'])
+        elif kind == 'modification':
+            self.update_correction(operation['ancienne'], operation['nouvelle'], operation['variantes'])
+        elif kind == 'suppression':
+            self.remove_correction(operation['correction'])
+
+    def _log_operation(self, operation):
+        """Ajoute une opération à la fin du journal (écrite sur disque avant de rendre la main)"""
+        if self.corrections_file is None or self.replaying:
+            return
+        with self.journal_lock:
+            if self.journal is None:
+                self.journal = open(self.journal_paths(self.corrections_file)[1], 'a', encoding='utf-8')
+            self.journal.write(json.dumps(operation, ensure_ascii=False) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            self.journal_entries += 1
+        if self.journal_entries >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self, wait=False):
+        """Réécrit le fichier trié à partir du dictionnaire en mémoire, dans un thread séparé
+
+        Le journal courant est d'abord mis de côté : les modifications faites pendant le
+        compactage vont dans un nouveau journal. Il n'est supprimé qu'une fois le fichier
+        trié remplacé ; après un arrêt brutal, il est rejoué au chargement suivant.
+        """
+        if self.corrections_file is None:
+            return
+        with self.journal_lock:
+            if self.compaction_thread is not None and self.compaction_thread.is_alive():
+                if wait:
+                    self.compaction_thread.join()
+                return
+            compacting_path, journal_path = self.journal_paths(self.corrections_file)
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            if os.path.exists(journal_path):
+                if os.path.exists(compacting_path):
+                    # Compactage précédent interrompu : conserver l'ordre des opérations
+                    with open(journal_path, 'r', encoding='utf-8') as source, \
+                            open(compacting_path, 'a', encoding='utf-8') as target:
+                        target.write(source.read())
+                    os.remove(journal_path)
+                else:
+                    os.replace(journal_path, compacting_path)
+            elif not os.path.exists(compacting_path):
+                return
+            self.journal_entries = 0
+            corrections = {correction: set(variantes) for correction, variantes in self.corrections_perso.items()}
+            self.compaction_thread = threading.Thread(
+                target=self._write_compacted, args=(corrections, self.corrections_file, compacting_path), daemon=True)
+            self.compaction_thread.start()
+        if wait:
+            self.compaction_thread.join()
+
+    def _write_compacted(self, corrections, filename, compacting_path):
+        try:
+            self.save_custom_corrections(corrections, filename)
+            os.remove(compacting_path)
+        except OSError as e:
+            print(f"Échec du compactage du dictionnaire : {e}")
+
+    def close(self):
+        """Compacte le journal et attend la fin de l'écriture (fermeture de l'application)"""
+        self.compact(wait=True)
+
+    def take_changes(self):
+        """Retourne les corrections modifiées depuis le dernier appel (None : tout a pu changer)"""
+        changes = self.pending_changes
+        self.pending_changes = set()
+        return changes
+
+    def _mark_changed(self, correction):
+        if self.pending_changes is not None:
+            self.pending_changes.add(correction)
+            
+    def rebuild_index(self):
+        """Reconstruit l'index inversé variante -> correction"""
+        self.variant_index = {}
+        self.conflicts = {}
+        self.phrase_matcher = PhraseMatcher(fold_accents=self.accent_fold)
+        # Un mot correct se corrige toujours vers lui-même, quelle que soit sa place dans le fichier
+        for correction in self.corrections_perso:
+            self._index_variant(correction, correction)
+        for correction, variantes in self.corrections_perso.items():
+            for variante in variantes:
+                self._index_variant(variante, correction)
+
+    def _index_variant(self, variante, correction):
+        """Enregistre une variante dans l'index et note les conflits éventuels"""
+        cle = self.normalize_variant(variante)
+        if not cle:
+            return
+        if cle not in self.variant_index:
+            self.phrase_matcher.add(cle)
+        actuelle = self.variant_index.setdefault(cle, correction)
+        if actuelle == correction:
+            return
+        revendications = self.conflicts.setdefault(cle, [actuelle])
+        if correction not in revendications:
+            revendications.append(correction)
+
+    def _unindex_correction(self, correction):
+        """Retire une correction de l'index en redonnant ses variantes aux autres revendications"""
+        variantes = self.corrections_perso.get(correction, set())
+        for cle in {self.normalize_variant(v) for v in variantes} | {self.normalize_variant(correction)}:
+            revendications = self.conflicts.get(cle)
+            if revendications and correction in revendications:
+                revendications.remove(correction)
+                if len(revendications) == 1:
+                    del self.conflicts[cle]
+                self.variant_index[cle] = revendications[0]
+            elif self.variant_index.get(cle) == correction:
+                del self.variant_index[cle]
+                self.phrase_matcher.remove(cle)
+
+    def export_state(self):
+        """Retourne le dictionnaire et ses index (types simples, sérialisables avec marshal)"""
+        return {
+            'accent_fold': self.accent_fold,
+            'corrections': self.corrections_perso,
+            'variant_index': self.variant_index,
+            'conflicts': self.conflicts,
+            'matcher': self.phrase_matcher.export_state(),
+        }
+
+    def import_state(self, state):
+        """Remplace le dictionnaire et ses index par un état exporté (instantané compilé)"""
+        self.accent_fold = state['accent_fold']
+        self.corrections_perso = state['corrections']
+        self.variant_index = state['variant_index']
+        self.conflicts = state['conflicts']
+        self.phrase_matcher = PhraseMatcher.from_state(state['matcher'])
+        self.pending_changes = None
+        self.version += 1
+
+    def find_correction(self, word):
+        """Retourne la correction associée à un mot, ou None s'il n'est pas une variante connue"""
+        return self.variant_index.get(self.normalize_variant(word))
+
+    def find_phrases(self, text):
+        """Retourne les variantes présentes dans le texte, y compris multi-mots : [(début, fin, correction)]
+
+        Les occurrences retenues sont les plus longues et ne se chevauchent pas.
+        """
+        phrases = []
+        for start, end in self.phrase_matcher.find_longest(text):
+            correction = self.variant_index.get(self.normalize_variant(text[start:end]))
+            if correction is not None:
+                phrases.append((start, end, correction))
+        return phrases
+
+    def get_conflicts(self):
+        """Retourne les variantes revendiquées par plusieurs corrections"""
+        return {cle: list(revendications) for cle, revendications in self.conflicts.items()}
+
     def add_correction(self, correction, variante):
         """Ajoute une correction au dictionnaire"""
         if correction not in self.corrections_perso:
             self.corrections_perso[correction] = set()
-        self.corrections_perso[correction].add(variante.lower())
-        
+            self._index_variant(correction, correction)
+        self.corrections_perso[correction].update(self._variant_keys(correction, [variante]))
+        self._index_variant(variante, correction)
+        self._mark_changed(correction)
+        self.version += 1
+        self._log_operation({'op': 'ajout', 'correction': correction, 'variante': variante})
+
+    def update_correction(self, ancienne_correction, nouvelle_correction, variantes):
+        """Remplace une correction et ses variantes (boîte de dialogue de modification)"""
+        self._remove_entry(ancienne_correction)
+        self._remove_entry(nouvelle_correction)
+        cles = self._variant_keys(nouvelle_correction, variantes)
+        self.corrections_perso[nouvelle_correction] = cles
+        self._index_variant(nouvelle_correction, nouvelle_correction)
+        for cle in cles:
+            self._index_variant(cle, nouvelle_correction)
+        self._mark_changed(nouvelle_correction)
+        self.version += 1
+        self._log_operation({'op': 'modification', 'ancienne': ancienne_correction,
+                             'nouvelle': nouvelle_correction, 'variantes': sorted(cles)})
+
     def remove_correction(self, correction):
         """Supprime une correction du dictionnaire"""
-        if correction in self.corrections_perso:
-            del self.corrections_perso[correction]
-            
+        if self._remove_entry(correction):
+            self.version += 1
+            self._log_operation({'op': 'suppression', 'correction': correction})
+
+    def _remove_entry(self, correction):
+        """Retire une correction et ses variantes de l'index ; retourne False si elle est absente"""
+        if correction not in self.corrections_perso:
+            return False
+        self._unindex_correction(correction)
+        del self.corrections_perso[correction]
+        self._mark_changed(correction)
+        return True
+
     def get_correction_count(self):
         """Retourne le nombre de corrections dans le dictionnaire"""
         return len(self.corrections_perso)
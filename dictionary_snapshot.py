@@ -0,0 +1,599 @@
+import hashlib
+import marshal
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+import zlib
+import spellchecker
+from spellchecker import SpellChecker
+from spell_checker import SpellCheckerManager
+from dictionary_manager import DictionaryManager
+from phrase_matcher import ACCENT_TABLE, fold_text
+
+SNAPSHOT_FILE = 'dictionnaires.snapshot'
+LEXICON_MAGIC = b'CORRLEX1'
+PERSONAL_MAGIC = b'CORRPER1'
+# En-tête d'un fichier d'instantané : magique, nombre de sections, puis (position, taille) de chaque section
+SECTION = struct.Struct('<II')
+SLOT = struct.Struct('<III')  # Position du mot dans le bloc de chaînes + 1 (0 = alvéole vide), longueur, fréquence
+MAX_FREQUENCY = 2 ** 32 - 1
+# Table des variantes : numéro de la correction + 1 (0 si la clé n'est qu'un début de variante),
+# et ce drapeau si la clé est suivie d'un caractère non alphanumérique dans une variante plus longue
+VARIANT_PREFIX = 1 << 31
+WORD_RUN = re.compile(r'[^\W_]+')  # Suite de caractères alphanumériques (au sens de str.isalnum)
+
+
+def file_digest(path):
+    """Empreinte SHA-1 du contenu d'un fichier"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(path):
+    """Identifie une source par sa date de modification, sa taille et son empreinte"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (path, 0, -1, '')
+    return (path, stat.st_mtime_ns, stat.st_size, file_digest(path))
+
+
+def source_is_current(key):
+    """Vérifie qu'une source n'a pas changé : date et taille d'abord, empreinte si la date diffère"""
+    path, mtime_ns, size, digest = key
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return size == -1
+    if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+        return True
+    return stat.st_size == size and file_digest(path) == digest
+
+
+def journal_keys(corrections_file):
+    """Taille et empreinte actuelles des journaux d'un fichier de corrections : [(chemin, taille, empreinte)]"""
+    keys = []
+    for path in DictionaryManager.journal_paths(corrections_file):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+        keys.append((path, len(data), hashlib.sha1(data).hexdigest()))
+    return keys
+
+
+def journal_offsets(keys, corrections_file):
+    """Positions à partir desquelles rejouer les journaux, déjà intégrés jusqu'aux tailles de keys
+
+    Retourne None si un journal ne commence plus par le contenu intégré (compactage depuis).
+    """
+    paths = DictionaryManager.journal_paths(corrections_file)
+    if [key[0] for key in keys] != paths:
+        return None
+    offsets = []
+    for path, size, digest in keys:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read(size)
+        except FileNotFoundError:
+            data = b''
+        if len(data) != size or hashlib.sha1(data).hexdigest() != digest:
+            return None
+        offsets.append(size)
+    return offsets
+
+
+def language_dictionary_path(language):
+    """Chemin du dictionnaire de fréquences fourni par pyspellchecker"""
+    return os.path.join(os.path.dirname(spellchecker.__file__), 'resources', f'{language}.json.gz')
+
+
+def personal_snapshot_path(filename):
+    """Instantané du dictionnaire personnel associé à l'instantané du lexique filename"""
+    return f"{filename}.perso"
+
+
+def write_sections(filename, magic, meta, sections):
+    """Écrit un fichier d'instantané : métadonnées (marshal) puis sections
+
+    L'écriture passe par un fichier temporaire propre à l'appelant, mis en place par
+    os.replace : plusieurs processus peuvent reconstruire le même instantané.
+    """
+    sections = [marshal.dumps(meta)] + list(sections)
+    header = bytearray(magic) + struct.pack('<I', len(sections))
+    position = len(header) + len(sections) * SECTION.size
+    for section in sections:
+        header += SECTION.pack(position, len(section))
+        position += len(section)
+    directory, name = os.path.split(filename)
+    fd, temp_filename = tempfile.mkstemp(dir=directory or '.', prefix=f".{name}.", suffix='.tmp')
+    try:
+        with open(fd, 'wb') as f:
+            f.write(header)
+            for section in sections:
+                f.write(section)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        try:
+            os.unlink(temp_filename)
+        except OSError:
+            pass
+        raise
+
+
+def map_sections(filename, magic):
+    """Projette un fichier d'instantané en mémoire ; retourne (métadonnées, [sections]) ou None s'il est illisible"""
+    try:
+        with open(filename, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    # Les sections (memoryview) gardent la projection ouverte
+    buffer = memoryview(mapped)
+    try:
+        if buffer[:len(magic)] != magic:
+            raise ValueError(filename)
+        count = struct.unpack_from('<I', buffer, len(magic))[0]
+        sections = []
+        for index in range(count):
+            position, size = SECTION.unpack_from(buffer, len(magic) + 4 + index * SECTION.size)
+            if position + size > len(buffer):
+                raise ValueError(filename)
+            sections.append(buffer[position:position + size])
+        meta = marshal.loads(sections[0])
+    except (ValueError, EOFError, TypeError, IndexError, struct.error):
+        return None
+    return meta, sections[1:]
+
+
+class CompiledLexicon:
+    """Lexique {mot: fréquence} en table de hachage à adressage ouvert, lue directement dans un tampon
+
+    Le tampon est en général un fichier projeté en mémoire : le chargement ne coûte rien
+    et plusieurs processus partagent les mêmes pages.
+    """
+    def __init__(self, buffer, slot_count, word_count, longest_word_length, signature):
+        self.buffer = buffer
+        self.slots = buffer[0:slot_count * SLOT.size].cast('I')
+        self.blob = buffer[slot_count * SLOT.size:]
+        self.mask = slot_count - 1
+        self.word_count = word_count
+        self.longest_word_length = longest_word_length
+        self.signature = signature  # Empreinte du lexique source (clé de l'index de suggestions)
+
+    @staticmethod
+    def encode(frequencies):
+        """Sérialise un lexique {mot: fréquence} ; retourne (octets, nb d'alvéoles)"""
+        slot_count = 1
+        while slot_count < len(frequencies) * 2:
+            slot_count *= 2
+        mask = slot_count - 1
+        slots = [None] * slot_count
+        blob = bytearray()
+        for word, frequency in frequencies.items():
+            data = word.encode('utf-8')
+            slot = zlib.crc32(data) & mask
+            while slots[slot] is not None:
+                slot = (slot + 1) & mask
+            slots[slot] = (len(blob) + 1, len(data), min(frequency, MAX_FREQUENCY))
+            blob += data
+        table = bytearray(slot_count * SLOT.size)
+        for slot, entry in enumerate(slots):
+            if entry is not None:
+                SLOT.pack_into(table, slot * SLOT.size, *entry)
+        return bytes(table) + bytes(blob), slot_count
+
+    def get(self, word, default=None):
+        """Retourne la fréquence d'un mot, ou default s'il est absent"""
+        data = word.encode('utf-8')
+        slot = zlib.crc32(data) & self.mask
+        slots = self.slots
+        while True:
+            base = slot * 3
+            offset = slots[base]
+            if not offset:
+                return default
+            if slots[base + 1] == len(data) and self.blob[offset - 1:offset - 1 + len(data)] == data:
+                return slots[base + 2]
+            slot = (slot + 1) & self.mask
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def __getitem__(self, word):
+        frequency = self.get(word)
+        if frequency is None:
+            raise KeyError(word)
+        return frequency
+
+    def __len__(self):
+        return self.word_count
+
+    def items(self):
+        """Parcourt les paires (mot, fréquence)"""
+        slots = self.slots
+        for base in range(0, len(slots), 3):
+            offset = slots[base]
+            if offset:
+                yield bytes(self.blob[offset - 1:offset - 1 + slots[base + 1]]).decode('utf-8'), slots[base + 2]
+
+
+class CompiledStrings:
+    """Liste de chaînes en lecture seule, lue directement dans un tampon (nombre, positions, octets UTF-8)"""
+    def __init__(self, buffer):
+        self.count = struct.unpack_from('<I', buffer)[0]
+        self.offsets = buffer[4:8 + self.count * 4].cast('I')
+        self.blob = buffer[8 + self.count * 4:]
+
+    @staticmethod
+    def encode(strings):
+        """Sérialise une liste de chaînes"""
+        data = [string.encode('utf-8') for string in strings]
+        offsets = [0]
+        for item in data:
+            offsets.append(offsets[-1] + len(item))
+        return struct.pack(f'<{len(offsets) + 1}I', len(data), *offsets) + b''.join(data)
+
+    def __getitem__(self, index):
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+
+class CompiledPersonalDictionary:
+    """Dictionnaire personnel en lecture seule, lu directement dans l'instantané projeté en mémoire
+
+    Remplace DictionaryManager dans les processus de travail, qui ne font que rechercher
+    les variantes : rien n'est décodé au chargement et tous les processus partagent les
+    mêmes pages. Les variantes sont dans une table {clé: entier} au format du lexique ;
+    find_phrases essaie chaque début de mot et s'arrête dès que la clé n'est plus le début
+    d'une variante. Il retourne les mêmes occurrences que DictionaryManager.find_phrases.
+    """
+    def __init__(self, variants, corrections, accent_fold, initials, version=0):
+        self.variants = variants  # CompiledLexicon {variante normalisée: voir VARIANT_PREFIX}
+        self.corrections_perso = corrections  # CompiledStrings des mots corrects (parcourus par sync_dictionary)
+        self.accent_fold = accent_fold
+        # Premiers caractères non alphanumériques des variantes (débuts à essayer hors début de mot)
+        self.initials = initials
+        self.version = version  # Génération de l'index (voir parallel_check), jamais modifié ensuite
+
+    @staticmethod
+    def encode(corrections_perso, variant_index):
+        """Sérialise les mots corrects et l'index {variante normalisée: correction}
+
+        Retourne (table des variantes, nb d'alvéoles, mots corrects, débuts non alphanumériques).
+        """
+        # Les deux peuvent être copiés pendant une modification : aucune correction indexée ne doit manquer
+        corrections = sorted(set(corrections_perso).union(variant_index.values()))
+        numbers = {correction: number for number, correction in enumerate(corrections, 1)}
+        values = {}
+        initials = set()
+        for key, correction in variant_index.items():
+            values[key] = values.get(key, 0) | numbers[correction]
+            if not key[0].isalnum():
+                initials.add(key[0])
+            for position in range(1, len(key)):
+                if not key[position].isalnum():
+                    prefix = key[:position]
+                    values[prefix] = values.get(prefix, 0) | VARIANT_PREFIX
+        table_bytes, slot_count = CompiledLexicon.encode(values)
+        return table_bytes, slot_count, CompiledStrings.encode(corrections), "".join(sorted(initials))
+
+    def normalize_variant(self, variante):
+        """Forme normalisée d'une variante (voir DictionaryManager.normalize_variant)"""
+        cle = variante.strip().lower()
+        return cle.translate(ACCENT_TABLE) if self.accent_fold else cle
+
+    def find_correction(self, word):
+        """Retourne la correction associée à un mot, ou None s'il n'est pas une variante connue"""
+        number = self.variants.get(self.normalize_variant(word), 0) & ~VARIANT_PREFIX
+        return self.corrections_perso[number - 1] if number else None
+
+    def _starts(self, text, lowered):
+        """Débuts possibles des variantes, dans l'ordre : (position, première fin possible)"""
+        starts = [(match.start(), match.end()) for match in WORD_RUN.finditer(text)]
+        if not self.initials:
+            return starts
+        for match in re.finditer(f"[{re.escape(self.initials)}]", lowered):
+            start = match.start()
+            if text[start].isalnum() or (start and text[start - 1].isalnum()):
+                continue
+            starts.append((start, self._next_end(text, start)))
+        return sorted(starts)
+
+    @staticmethod
+    def _next_end(text, end):
+        """Fin possible suivante : position suivie d'un caractère non alphanumérique, ou fin du texte"""
+        end += 1
+        if end < len(text) and text[end].isalnum():
+            end = WORD_RUN.match(text, end).end()
+        return end
+
+    def find_phrases(self, text):
+        """Retourne les variantes présentes dans le texte, y compris multi-mots : [(début, fin, correction)]
+
+        Les occurrences retenues sont les plus longues et ne se chevauchent pas.
+        """
+        lowered = fold_text(text, self.accent_fold)
+        get = self.variants.get
+        text_length = len(text)
+        phrases = []
+        last_end = 0
+        for start, end in self._starts(text, lowered):
+            if start < last_end:
+                continue
+            longest = 0
+            number = 0
+            while True:
+                value = get(lowered[start:end], 0)
+                if value & ~VARIANT_PREFIX:
+                    longest, number = end, value & ~VARIANT_PREFIX
+                if not value & VARIANT_PREFIX or end >= text_length:
+                    break
+                end = self._next_end(text, end)
+            if not longest:
+                continue
+            last_end = longest
+            key = self.normalize_variant(text[start:longest])
+            if key != lowered[start:longest]:
+                number = get(key, 0) & ~VARIANT_PREFIX
+            if number:
+                phrases.append((start, longest, self.corrections_perso[number - 1]))
+        return phrases
+
+    def get_correction_count(self):
+        return len(self.corrections_perso)
+
+
+class PersonalSnapshot:
+    """Instantané du dictionnaire personnel : état complet (marshal) et index compilé en lecture seule
+
+    Il n'est identifié que par le fichier de corrections et la normalisation des variantes.
+    Les journaux déjà intégrés sont notés (taille et empreinte) : les modifications
+    journalisées ensuite sont rejouées au chargement, sans reconstruire l'instantané.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, meta, sections):
+        self.meta = meta
+        self.state_section, self.variants_section, self.corrections_section = sections
+        self.accent_fold = meta['accent_fold']
+        self.journal_offsets = None  # Positions des modifications à rejouer dans chaque journal
+        self.journal_tail = False  # Des modifications journalisées ne sont pas dans l'instantané
+
+    @classmethod
+    def save(cls, filename, corrections, variant_index, accent_fold, state=None, sources=(), journals=(),
+             generation=0):
+        """Enregistre un dictionnaire ; sans state, seul l'index en lecture seule est écrit"""
+        variants_bytes, slot_count, corrections_bytes, initials = CompiledPersonalDictionary.encode(
+            corrections, variant_index)
+        meta = {'version': cls.FORMAT_VERSION, 'sources': list(sources), 'journals': list(journals),
+                'accent_fold': accent_fold, 'generation': generation, 'variant_slots': slot_count,
+                'variant_count': len(variant_index), 'initials': initials}
+        state_bytes = marshal.dumps(state) if state is not None else b''
+        write_sections(filename, PERSONAL_MAGIC, meta, [state_bytes, variants_bytes, corrections_bytes])
+
+    @classmethod
+    def save_manager(cls, filename, dict_manager, corrections_file, sources=None, journals=None):
+        """Enregistre un dictionnaire chargé, avec les modifications qu'il contient"""
+        # Relevés avant l'export : une modification faite entre-temps serait rejouée, pas perdue
+        if sources is None:
+            sources = [source_key(corrections_file)]
+            journals = journal_keys(corrections_file)
+        state = dict_manager.export_state()
+        cls.save(filename, state['corrections'], state['variant_index'], dict_manager.accent_fold, state,
+                 sources, journals)
+
+    @classmethod
+    def build(cls, filename, corrections_file, accent_fold=False):
+        """Compile le fichier de corrections et ses journaux"""
+        sources = [source_key(corrections_file)]
+        journals = journal_keys(corrections_file)
+        dict_manager = DictionaryManager(accent_fold)
+        dict_manager.load_custom_corrections(corrections_file)
+        cls.save_manager(filename, dict_manager, corrections_file, sources, journals)
+
+    @classmethod
+    def load(cls, filename, corrections_file=None, accent_fold=False):
+        """Projette l'instantané en mémoire ; retourne None s'il est absent ou illisible
+
+        Avec corrections_file, retourne aussi None s'il a été compilé à partir d'un autre
+        fichier ou d'une autre version de celui-ci, ou avec une autre normalisation.
+        """
+        mapped = map_sections(filename, PERSONAL_MAGIC)
+        if mapped is None:
+            return None
+        meta, sections = mapped
+        try:
+            if meta['version'] != cls.FORMAT_VERSION or len(sections) != 3:
+                return None
+            snapshot = cls(meta, sections)
+            if corrections_file is None:
+                return snapshot
+            sources = meta['sources']
+            if ([key[0] for key in sources] != [corrections_file] or meta['accent_fold'] != accent_fold
+                    or not all(source_is_current(tuple(key)) for key in sources)):
+                return None
+            offsets = journal_offsets(meta['journals'], corrections_file)
+        except (KeyError, TypeError, ValueError):
+            return None
+        if offsets is None:
+            return None
+        snapshot.journal_offsets = offsets
+        snapshot.journal_tail = any(os.path.exists(path) and os.path.getsize(path) > offset for path, offset
+                                    in zip(DictionaryManager.journal_paths(corrections_file), offsets))
+        return snapshot
+
+    def create_dict_manager(self, corrections_file='mots-corrections.txt'):
+        """Crée le gestionnaire du dictionnaire personnel et rejoue les modifications journalisées depuis
+        (les modifications suivantes sont journalisées dans corrections_file)"""
+        dict_manager = DictionaryManager()
+        dict_manager.import_state(marshal.loads(self.state_section))
+        dict_manager.corrections_file = corrections_file
+        if self.journal_tail:
+            dict_manager.replay_journal(corrections_file, self.journal_offsets)
+        return dict_manager
+
+    def create_read_only_dict_manager(self):
+        """Crée le dictionnaire personnel en lecture seule, lu directement dans l'instantané"""
+        meta = self.meta
+        variants = CompiledLexicon(self.variants_section, meta['variant_slots'], meta['variant_count'], 0, None)
+        return CompiledPersonalDictionary(variants, CompiledStrings(self.corrections_section), self.accent_fold,
+                                          meta['initials'], meta['generation'])
+
+
+class DictionarySnapshot:
+    """Instantanés compilés du lexique et du dictionnaire personnel
+
+    Le lexique (filename) ne dépend que du dictionnaire de fréquences de pyspellchecker ;
+    le dictionnaire personnel (filename.perso, voir PersonalSnapshot) ne dépend que du
+    fichier de corrections. Chacun n'est reconstruit que si sa propre source a changé :
+    une modification du dictionnaire personnel ne recompile jamais le lexique.
+    """
+    FORMAT_VERSION = 4
+
+    def __init__(self, lexicon, personal, ignored_words):
+        self.lexicon = lexicon
+        self.personal = personal
+        self.ignored_words = ignored_words
+
+    @classmethod
+    def build_lexicon(cls, filename, language='fr'):
+        """Compile le lexique et l'enregistre"""
+        source = source_key(language_dictionary_path(language))
+        frequencies = SpellChecker(language=language).word_frequency.dictionary
+        lexicon_bytes, slot_count = CompiledLexicon.encode(frequencies)
+        meta = {'version': cls.FORMAT_VERSION, 'source': source, 'slot_count': slot_count,
+                'word_count': len(frequencies),
+                'longest_word_length': max((len(word) for word in frequencies), default=0)}
+        write_sections(filename, LEXICON_MAGIC, meta, [lexicon_bytes])
+
+    @classmethod
+    def load_lexicon(cls, filename, language='fr'):
+        """Projette le lexique en mémoire ; retourne None s'il est absent, illisible ou périmé"""
+        mapped = map_sections(filename, LEXICON_MAGIC)
+        if mapped is None:
+            return None
+        meta, sections = mapped
+        try:
+            source = meta['source']
+            if (meta['version'] != cls.FORMAT_VERSION or source[0] != language_dictionary_path(language)
+                    or not source_is_current(tuple(source))):
+                return None
+            return CompiledLexicon(sections[0], meta['slot_count'], meta['word_count'],
+                                   meta['longest_word_length'], source[3])
+        except (KeyError, TypeError, ValueError, IndexError):
+            return None
+
+    @classmethod
+    def load_or_build(cls, filename=SNAPSHOT_FILE, language='fr', corrections_file='mots-corrections.txt',
+                      ignore_file='dictionnaire_ignore.txt', accent_fold=False, read_only=False, timings=None):
+        """Charge les instantanés, en reconstruisant d'abord celui dont la source a changé
+
+        Avec read_only, les modifications journalisées depuis la compilation du dictionnaire
+        personnel y sont intégrées (l'index en lecture seule ne peut pas les rejouer).
+        Retourne None si un instantané ne peut pas être écrit.
+        """
+        if timings is None:
+            timings = {}
+        start_time = time.perf_counter()
+        lexicon = cls.load_lexicon(filename, language)
+        if lexicon is None:
+            try:
+                cls.build_lexicon(filename, language)
+            except OSError:
+                return None
+            lexicon = cls.load_lexicon(filename, language)
+        timings['lexique'] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        personal_file = personal_snapshot_path(filename)
+        personal = PersonalSnapshot.load(personal_file, corrections_file, accent_fold)
+        if personal is None or (read_only and personal.journal_tail):
+            try:
+                if personal is None:
+                    PersonalSnapshot.build(personal_file, corrections_file, accent_fold)
+                else:
+                    PersonalSnapshot.save_manager(personal_file, personal.create_dict_manager(corrections_file),
+                                                  corrections_file)
+            except OSError:
+                return None
+            personal = PersonalSnapshot.load(personal_file, corrections_file, accent_fold)
+        timings['instantané du dictionnaire personnel'] = time.perf_counter() - start_time
+        if lexicon is None or personal is None:
+            return None
+        return cls(lexicon, personal, SpellCheckerManager.load_ignored_words(ignore_file))
+
+    def create_spell_manager(self, **spell_options):
+        """Crée le gestionnaire du correcteur à partir du lexique de l'instantané"""
+        return SpellCheckerManager(lexicon=self.lexicon, ignored_words=self.ignored_words, **spell_options)
+
+    def create_dict_manager(self, corrections_file='mots-corrections.txt'):
+        """Crée le gestionnaire du dictionnaire personnel (voir PersonalSnapshot.create_dict_manager)"""
+        return self.personal.create_dict_manager(corrections_file)
+
+    def create_read_only_dict_manager(self):
+        """Crée le dictionnaire personnel en lecture seule, lu directement dans l'instantané"""
+        return self.personal.create_read_only_dict_manager()
+
+
+def save_personal_snapshot(dict_manager, filename=SNAPSHOT_FILE):
+    """Enregistre l'instantané du dictionnaire personnel chargé dans dict_manager, s'il est périmé
+
+    Appelé à la fermeture de l'interface, après le compactage : le démarrage suivant
+    n'a pas à recompiler le fichier de corrections qui vient d'être réécrit.
+    Retourne True si l'instantané a été réécrit.
+    """
+    personal_file = personal_snapshot_path(filename)
+    corrections_file = dict_manager.corrections_file
+    personal = PersonalSnapshot.load(personal_file, corrections_file, dict_manager.accent_fold)
+    if personal is not None and not personal.journal_tail:
+        return False
+    PersonalSnapshot.save_manager(personal_file, dict_manager, corrections_file)
+    return True
+
+
+def load_managers(filename=SNAPSHOT_FILE, language='fr', corrections_file='mots-corrections.txt',
+                  ignore_file='dictionnaire_ignore.txt', timings=None, accent_fold=False, read_only=False,
+                  **spell_options):
+    """Crée les gestionnaires depuis les instantanés compilés, ou depuis les sources s'ils sont inutilisables
+
+    Si timings est un dictionnaire, la durée de chaque phase du chargement y est enregistrée.
+    Avec accent_fold, les variantes du dictionnaire personnel ne tiennent pas compte des accents.
+    Avec read_only (processus de travail), le dictionnaire personnel est lu directement dans
+    l'instantané et ne peut pas être modifié : les processus partagent sa mémoire.
+    """
+    if timings is None:
+        timings = {}
+    start_time = time.perf_counter()
+    snapshot = DictionarySnapshot.load_or_build(filename, language, corrections_file, ignore_file, accent_fold,
+                                                read_only, timings)
+    if snapshot is not None:
+        spell_manager = snapshot.create_spell_manager(language=language, **spell_options)
+    else:
+        spell_manager = SpellCheckerManager(language=language, **spell_options)
+        spell_manager.ignored_words = spell_manager.load_ignored_words(ignore_file)
+        timings['lexique'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    if snapshot is not None and read_only:
+        dict_manager = snapshot.create_read_only_dict_manager()
+    elif snapshot is not None:
+        dict_manager = snapshot.create_dict_manager(corrections_file)
+    else:
+        dict_manager = DictionaryManager(accent_fold)
+        dict_manager.load_custom_corrections(corrections_file)
+    timings['dictionnaire personnel'] = time.perf_counter() - start_time
+    return spell_manager, dict_manager
@@ -0,0 +1,113 @@
+import bisect
+from unidecode import unidecode
+
+
+def wrap_variants(variantes, width=80):
+    """Trie les variantes et les répartit sur plusieurs lignes d'environ width caractères"""
+    variantes_formatees = []
+    ligne_courante = []
+    longueur_courante = 0
+    for variante in sorted(variantes):
+        # Ajouter la longueur de la variante plus la virgule et l'espace
+        longueur_variante = len(variante) + 2
+        # Si l'ajout de cette variante dépasse la largeur, commencer une nouvelle ligne
+        if longueur_courante + longueur_variante > width and ligne_courante:
+            variantes_formatees.append(", ".join(ligne_courante))
+            ligne_courante = []
+            longueur_courante = 0
+        ligne_courante.append(variante)
+        longueur_courante += longueur_variante
+    if ligne_courante:
+        variantes_formatees.append(", ".join(ligne_courante))
+    return "\n".join(variantes_formatees)
+
+
+def sort_key(text):
+    """Clé de tri insensible à la casse et aux accents"""
+    return unidecode(text).lower()
+
+
+class DictionaryView:
+    """Lignes du tableau du dictionnaire personnel, dans l'ordre d'affichage
+
+    Le texte des variantes et les clés de tri de chaque entrée sont mis en cache :
+    sync ne recalcule que les entrées ajoutées, retirées ou modifiées, et l'ordre
+    est tenu à jour par insertion dichotomique au lieu d'un tri complet.
+    """
+    COLUMNS = ("Correction", "Variantes")
+
+    def __init__(self):
+        self.entries = {}  # {correction: (variantes, texte des variantes, clé correction, clé variantes)}
+        self.sort_column = "Correction"
+        self.reverse = False
+        self.order = []  # [(clé de tri, correction)] par ordre croissant
+
+    def __len__(self):
+        return len(self.order)
+
+    def _order_key(self, correction):
+        _, _, correction_key, variants_key = self.entries[correction]
+        return (correction_key if self.sort_column == "Correction" else variants_key, correction)
+
+    def _add(self, correction, variantes):
+        wrapped = wrap_variants(variantes)
+        self.entries[correction] = (frozenset(variantes), wrapped, sort_key(correction), sort_key(wrapped))
+        bisect.insort(self.order, self._order_key(correction))
+
+    def _remove(self, correction):
+        position = bisect.bisect_left(self.order, self._order_key(correction))
+        del self.order[position]
+        del self.entries[correction]
+
+    def sync(self, corrections, keys=None):
+        """Met à jour les lignes à partir de {correction: variantes}, retourne les corrections modifiées
+
+        keys limite la comparaison aux corrections indiquées (voir DictionaryManager.take_changes).
+        """
+        changed = set()
+        if keys is None:
+            removed = self.entries.keys() - corrections.keys()
+            keys = corrections.keys()
+        else:
+            removed = {correction for correction in keys if correction not in corrections and correction in self.entries}
+        for correction in removed:
+            self._remove(correction)
+            changed.add(correction)
+        for correction in keys:
+            variantes = corrections.get(correction)
+            if variantes is None:
+                continue
+            entry = self.entries.get(correction)
+            if entry is not None:
+                if entry[0] == variantes:
+                    continue
+                self._remove(correction)
+            self._add(correction, variantes)
+            changed.add(correction)
+        return changed
+
+    def sort(self, column, reverse):
+        """Trie les lignes selon une colonne, à partir des clés en cache"""
+        if column != self.sort_column:
+            self.sort_column = column
+            self.order = sorted(self._order_key(correction) for correction in self.entries)
+        self.reverse = reverse
+
+    def correction_at(self, index):
+        """Retourne la correction affichée à la position index"""
+        if self.reverse:
+            index = len(self.order) - 1 - index
+        return self.order[index][1]
+
+    def index_of(self, correction):
+        """Retourne la position d'affichage d'une correction, ou None si elle est absente"""
+        if correction not in self.entries:
+            return None
+        index = bisect.bisect_left(self.order, self._order_key(correction))
+        return len(self.order) - 1 - index if self.reverse else index
+
+    def rows(self, start, count):
+        """Retourne les lignes [(correction, texte des variantes)] affichées de start à start + count"""
+        end = min(start + count, len(self.order))
+        return [(correction, self.entries[correction][1])
+                for correction in map(self.correction_at, range(max(start, 0), end))]
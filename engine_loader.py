@@ -0,0 +1,33 @@
+import queue
+import threading
+import time
+
+
+class EngineLoader:
+    """Charge le correcteur et les dictionnaires dans un thread séparé, après l'affichage de la fenêtre
+
+    Le résultat est déposé dans une file d'attente lue par le thread Tk :
+    ('pret', spell_manager, dict_manager, durées) ou ('echec', exception).
+    Les durées sont un dictionnaire {phase: secondes}.
+    """
+    def __init__(self, **options):
+        self.options = options  # Transmises à dictionary_snapshot.load_managers
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Démarre le chargement"""
+        self.thread.start()
+
+    def _run(self):
+        timings = {}
+        try:
+            start_time = time.perf_counter()
+            # Import différé : pyspellchecker n'est pas chargé avant l'affichage de la fenêtre
+            from dictionary_snapshot import load_managers
+            timings['import du correcteur'] = time.perf_counter() - start_time
+            spell_manager, dict_manager = load_managers(timings=timings, **self.options)
+        except Exception as e:
+            self.queue.put(('echec', e))
+            return
+        self.queue.put(('pret', spell_manager, dict_manager, timings))
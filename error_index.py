@@ -0,0 +1,141 @@
+import bisect
+from collections import Counter
+
+
+class ErrorIndex:
+    """Erreurs du document rangées par ligne, tenues à jour au fil des modifications du texte
+
+    Les lignes sont numérotées comme dans le widget Text (à partir de 1). Une ligne
+    modifiée perd ses erreurs et devient « sale » jusqu'à sa prochaine vérification.
+
+    Chaque mot connaît les lignes où il est en erreur : retrouver ses occurrences ne
+    parcourt que ces lignes. Les listes de lignes sont modifiées sur place pour garder
+    leur identité quand des lignes sont insérées ou supprimées avant elles ; seuls
+    leurs numéros sont recalculés, une fois, au premier besoin après un tel décalage.
+    """
+    def __init__(self):
+        self.lines = [[]]  # lines[i] = [(colonne_début, colonne_fin, mot)] pour la ligne i + 1
+        self.counts = Counter()  # {mot: nombre d'occurrences en erreur dans le document}
+        self.dirty = set()  # Lignes à revérifier
+        self.touched = set()  # Mots dont le nombre d'occurrences a changé depuis le dernier relevé
+        self.word_lines = {}  # {mot: {id(liste de la ligne): liste de la ligne}}
+        self.line_numbers = None  # {id(liste de la ligne): numéro}, None après un décalage des lignes
+
+    def reset(self, line_count):
+        """Vide l'index pour un document de line_count lignes"""
+        self.lines = [[] for _ in range(max(line_count, 1))]
+        self.touched.update(self.counts)
+        self.counts.clear()
+        self.dirty.clear()
+        self.word_lines.clear()
+        self.line_numbers = None
+
+    def line_count(self):
+        return len(self.lines)
+
+    def append_lines(self, count):
+        """Ajoute count lignes vides à la fin (texte chargé par morceaux)"""
+        first = len(self.lines)
+        self.lines.extend([] for _ in range(count))
+        if self.line_numbers is not None:
+            for number in range(first, len(self.lines)):
+                self.line_numbers[id(self.lines[number])] = number + 1
+
+    def add_errors(self, errors):
+        """Ajoute des erreurs [(ligne, colonne_début, colonne_fin, mot)] issues d'une vérification complète"""
+        for line, start, end, word in errors:
+            row = self.lines[line - 1]
+            row.append((start, end, word))
+            self._count(word, row)
+
+    def line_errors(self, line):
+        """Retourne les erreurs d'une ligne"""
+        return self.lines[line - 1]
+
+    def set_line_errors(self, line, errors):
+        """Remplace les erreurs [(colonne_début, colonne_fin, mot)] d'une ligne revérifiée"""
+        self._drop_line(line)
+        row = self.lines[line - 1]
+        row.extend(errors)
+        for _, _, word in errors:
+            self._count(word, row)
+        self.dirty.discard(line)
+
+    def _count(self, word, row):
+        """Compte une occurrence en erreur de word dans la ligne row"""
+        self.counts[word] += 1
+        self.touched.add(word)
+        self.word_lines.setdefault(word, {})[id(row)] = row
+
+    def _drop_line(self, line):
+        """Retire les erreurs d'une ligne du décompte"""
+        row = self.lines[line - 1]
+        for _, _, word in row:
+            self.counts[word] -= 1
+            if self.counts[word] <= 0:
+                del self.counts[word]
+            self.touched.add(word)
+            rows = self.word_lines.get(word)
+            if rows is not None:
+                rows.pop(id(row), None)
+                if not rows:
+                    del self.word_lines[word]
+        row.clear()
+
+    def _shift_dirty(self, after_line, delta):
+        """Décale les lignes sales situées après after_line"""
+        self.dirty = {line + delta if line > after_line else line for line in self.dirty}
+
+    def on_insert(self, line, new_lines):
+        """Texte inséré dans une ligne, ajoutant new_lines retours à la ligne"""
+        self._drop_line(line)
+        if new_lines:
+            self.lines[line:line] = [[] for _ in range(new_lines)]
+            self.line_numbers = None
+            self._shift_dirty(line, new_lines)
+        self.dirty.update(range(line, line + new_lines + 1))
+
+    def on_delete(self, first_line, last_line):
+        """Texte supprimé entre first_line et last_line : ces lignes fusionnent en first_line"""
+        for line in range(first_line, last_line + 1):
+            self._drop_line(line)
+        if last_line > first_line:
+            del self.lines[first_line:last_line]
+            self.line_numbers = None
+            self.dirty = {line for line in self.dirty if not first_line < line <= last_line}
+            self._shift_dirty(last_line, first_line - last_line)
+        self.dirty.add(first_line)
+
+    def take_dirty(self, limit):
+        """Retire et retourne jusqu'à limit lignes sales, dans l'ordre du document"""
+        lines = sorted(self.dirty)[:limit]
+        self.dirty.difference_update(lines)
+        return lines
+
+    def take_touched(self):
+        """Retourne les mots dont le nombre d'occurrences en erreur a changé depuis le dernier appel"""
+        touched = self.touched
+        self.touched = set()
+        return touched
+
+    def occurrences(self, word):
+        """Retourne les positions [(ligne, colonne_début, colonne_fin)] d'un mot en erreur, dans l'ordre du document"""
+        rows = self.word_lines.get(word)
+        if not rows:
+            return []
+        if self.line_numbers is None:
+            self.line_numbers = {id(row): number for number, row in enumerate(self.lines, 1)}
+        positions = []
+        for key, row in rows.items():
+            line = self.line_numbers[key]
+            positions.extend((line, start, end) for start, end, error in row if error == word)
+        positions.sort()
+        return positions
+
+    def next_occurrence(self, word, line, column):
+        """Retourne la première occurrence en erreur de word après (line, column), en reprenant au début"""
+        positions = self.occurrences(word)
+        if not positions:
+            return None
+        index = bisect.bisect_right(positions, (line, column, float('inf')))
+        return positions[index % len(positions)]
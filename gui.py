@@ -1,23 +1,49 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import string
-from spell_checker import SpellCheckerManager
-from dictionary_manager import DictionaryManager
-import re
-from unidecode import unidecode
+import os
+import queue
+import bisect
+import time
+from engine_loader import EngineLoader
+from suggestion_prefetcher import SuggestionPrefetcher
+from check_worker import SpellCheckWorker, FileCheckWorker
+from correction_engine import check_line
+from error_index import ErrorIndex
+from dictionary_view import DictionaryView
+from instrumentation import Instrumentation
+from suggestion_cache import SuggestionCache
 
 class SpellCheckerGUI:
-    def __init__(self, root):
+    CHECK_POLL_MS = 50  # Intervalle de lecture des résultats de la vérification
+    RECHECK_DELAY_MS = 1  # Délai avant la revérification des lignes modifiées
+    RECHECK_BATCH_LINES = 200  # Nombre maximal de lignes revérifiées entre deux événements Tk
+    LAZY_HIGHLIGHTING = True  # Ne surligner que les lignes visibles (plus une marge)
+    VIEWPORT_MARGIN_LINES = 50  # Lignes surlignées au-dessus et au-dessous de la zone visible
+    ENGINE_POLL_MS = 50  # Intervalle de lecture du résultat du chargement des dictionnaires
+    PREFETCH_WORKERS = 2  # Threads de préchargement des suggestions
+    PREFETCH_AHEAD = 20  # Erreurs préchargées en priorité après les lignes visibles de la liste
+    DICT_HEADING_HEIGHT = 25  # Hauteur estimée des en-têtes du tableau du dictionnaire (avant le premier affichage)
+    OCCURRENCE_MARK = "occurrence_courante"  # Repère de l'occurrence affichée du mot sélectionné
+    
+    def __init__(self, root, startup_timings=None, started_at=None, instrumentation=None):
         self.root = root
         self.root.title("Correcteur Orthographique")
         self.root.geometry("1900x1000")
         
-        # Initialisation des gestionnaires
-        self.spell_manager = SpellCheckerManager()
-        self.dict_manager = DictionaryManager()
+        # Les gestionnaires sont chargés dans un thread séparé après l'affichage de la fenêtre
+        # (voir start_engine_loading) ; ils valent None tant que le chargement n'est pas terminé
+        self.spell_manager = None
+        self.dict_manager = None
+        self.engine_loader = None
+        self.check_requested = False  # Vérification demandée pendant le chargement
         
-        # Chargement des corrections personnalisées
-        self.dict_manager.corrections_perso = self.dict_manager.load_custom_corrections()
+        # Durées des phases du démarrage {phase: secondes}, complétées au fil du chargement
+        self.startup_timings = dict(startup_timings or {})
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        
+        # Relevé des durées de chaque phase (désactivé par défaut, voir main.py)
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
         
         # Variable pour la barre de progression
         self.progress_var = tk.DoubleVar()
@@ -26,8 +52,32 @@ class SpellCheckerGUI:
         self.selected_error_word = None
         self.selected_error_index = None
         
+        # Vérification orthographique en cours (thread séparé)
+        self.check_worker = None
+        self.corrections_made = 0
+        self.text_changed_during_check = False
+        
+        # Erreurs par ligne, tenues à jour au fil des modifications du texte
+        self.error_index = ErrorIndex()
+        self.error_words = []  # Mots affichés dans la liste des erreurs (triés, même ordre que la liste)
+        self.tracking_suspended = False
+        self.recheck_pending = False
+        
+        # Surlignage limité à la zone visible du texte
+        self.lazy_highlighting = self.LAZY_HIGHLIGHTING
+        self.highlighted_range = None  # (première ligne, dernière ligne) actuellement surlignées
+        self.highlight_pending = False
+        self.highlights_hidden = False  # Surlignages effacés par l'utilisateur jusqu'à la prochaine vérification
+        
+        # Suggestions précalculées pour les erreurs de la dernière vérification
+        self.suggestion_prefetcher = None
+        self.prefetch_version = None  # Version du dictionnaire personnel utilisée par le préchargement
+        
+        # Processus de vérification des longs documents (créés à la première vérification qui en a besoin)
+        self.parallel_checker = None
+        
         self.setup_gui()
-        self.refresh_dict()
+        self.start_engine_loading()
         
     def setup_gui(self):
         """Configure l'interface graphique principale"""
@@ -52,6 +102,15 @@ class SpellCheckerGUI:
         # Bind pour le double-clic sur le dictionnaire personnel
         self.dict_tree.bind('<Double-1>', self.on_dict_word_double_click)
         
+        # Annuler la vérification en cours à la fermeture
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Suivi des lignes modifiées pour la revérification incrémentale
+        self.install_text_tracker()
+        
+        # Mise à jour des surlignages au défilement du texte
+        self.text_area.configure(yscrollcommand=self.on_text_scroll)
+        
     def create_toolbar(self):
         """Crée la barre d'outils"""
         toolbar = ttk.Frame(self.root)
@@ -60,7 +119,7 @@ class SpellCheckerGUI:
         ttk.Button(toolbar, text="Ouvrir", command=self.open_file).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="Sauvegarder", command=self.save_file).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="Corriger", command=self.check_spelling).pack(side=tk.LEFT, padx=2)
-        ttk.Button(toolbar, text="Effacer surlignages", command=self.clear_highlights).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Effacer surlignages", command=self.hide_highlights).pack(side=tk.LEFT, padx=2)
 
     def create_main_area(self):
         """Crée la zone principale de l'interface"""
@@ -95,6 +154,7 @@ class SpellCheckerGUI:
         self.error_listbox = tk.Listbox(self.correction_frame, font=('Arial', 11))
         self.error_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.error_listbox.bind('<<ListboxSelect>>', self.on_select_error)
+        self.error_listbox.configure(yscrollcommand=self.on_error_list_scroll)
         
         # Frame pour les suggestions
         suggestions_frame = ttk.Frame(self.correction_frame)
@@ -110,6 +170,7 @@ class SpellCheckerGUI:
         buttons_frame.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Button(buttons_frame, text="Corriger", command=self.apply_correction).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Suivant", command=self.goto_next_occurrence).pack(side=tk.LEFT, padx=2)
         # ttk.Button(buttons_frame, text="Ignorer", command=self.ignore_word).pack(side=tk.LEFT, padx=2)
         
     def create_dictionary_frame(self, parent):
@@ -129,6 +190,11 @@ class SpellCheckerGUI:
         self.dict_tree.column("Correction", width=150, minwidth=150)
         self.dict_tree.column("Variantes", width=400, minwidth=400, stretch=True)
         
+        # Seule la fenêtre de lignes visibles est insérée dans le Treeview
+        self.dict_view = DictionaryView()
+        self.dict_offset = 0  # Position de la première ligne affichée
+        self.dict_window_rows = 20  # Nombre de lignes affichées, ajusté à la hauteur du tableau
+        
         # Variables pour le redimensionnement des lignes
         self.current_row_height = 30
         self.is_resizing = False
@@ -145,12 +211,19 @@ class SpellCheckerGUI:
         self.dict_tree.bind('<ButtonRelease-1>', self.end_resize)
         self.dict_tree.bind('<<TreeviewSelect>>', self.on_dict_select)
         
+        # Défilement de la fenêtre de lignes affichées
+        self.dict_tree.bind('<Configure>', self.on_dict_tree_configure)
+        self.dict_tree.bind('<MouseWheel>', self.on_dict_mouse_wheel)
+        self.dict_tree.bind('<Button-4>', lambda event: self.scroll_dict(-3))
+        self.dict_tree.bind('<Button-5>', lambda event: self.scroll_dict(3))
+        self.dict_tree.bind('<Up>', lambda event: self.on_dict_arrow_key(-1))
+        self.dict_tree.bind('<Down>', lambda event: self.on_dict_arrow_key(1))
+        
         self.dict_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Barre de défilement
-        dict_scrollbar = ttk.Scrollbar(self.dict_frame, orient="vertical", command=self.dict_tree.yview)
-        dict_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.dict_tree.configure(yscrollcommand=dict_scrollbar.set)
+        self.dict_scrollbar = ttk.Scrollbar(self.dict_frame, orient="vertical", command=self.on_dict_scrollbar)
+        self.dict_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
     def create_dictionary_buttons(self):
         """Crée les boutons du dictionnaire"""
@@ -174,17 +247,38 @@ class SpellCheckerGUI:
             filetypes=[("Fichiers texte", "*.txt"), ("Tous les fichiers", "*.*")]
         )
         if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    # Ajoute deux retours à la ligne après chaque point
-                    content = content.replace(". ", ".\n\n")
-                    content = content.replace(".\n", ".\n\n")  # Pour gérer les points déjà suivis d'un retour
-                    self.text_area.delete(1.0, tk.END)
-                    self.text_area.insert(1.0, content)
-                self.check_spelling()
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors de l'ouverture du fichier : {str(e)}")
+            self.load_file(file_path)
+            
+    def load_file(self, file_path):
+        """Charge un fichier par morceaux dans un thread séparé, en vérifiant chaque morceau dès sa lecture
+
+        Les retours à la ligne sont ajoutés après chaque point au fil de la lecture. Le texte
+        reste en lecture seule jusqu'à la fin du chargement.
+        """
+        self.cancel_check()
+        self.cancel_prefetch()
+        self.clear_highlights()
+        self.tracking_suspended = True
+        try:
+            self.text_area.delete("1.0", tk.END)
+        finally:
+            self.tracking_suspended = False
+        self.clear_error_list()
+        
+        self.text_changed_during_check = False
+        self.corrections_made = 0
+        self.progress_var.set(0)
+        self.status_label.config(text="Chargement du fichier...")
+        self.text_area.configure(state='disabled')
+        
+        # Sans dictionnaires chargés, le fichier est seulement affiché ; la vérification suivra
+        if self.spell_manager is None:
+            self.check_requested = True
+        self.instrumentation.begin_run("ouverture du fichier")
+        self.check_worker = FileCheckWorker(file_path, self.spell_manager, self.dict_manager,
+                                            instrumentation=self.instrumentation)
+        self.check_worker.start()
+        self.root.after(self.CHECK_POLL_MS, self.poll_check, self.check_worker)
                 
     def save_file(self):
         """Sauvegarde le fichier"""
@@ -202,117 +296,480 @@ class SpellCheckerGUI:
                 
     # Méthodes de correction orthographique
     def check_spelling(self):
-        """Vérifie l'orthographe du texte"""
-        self.error_listbox.delete(0, tk.END)
+        """Lance la vérification orthographique du texte dans un thread séparé"""
+        # Le fichier en cours de chargement est vérifié au fil de sa lecture
+        if isinstance(self.check_worker, FileCheckWorker):
+            return
+        self.cancel_check()
+        self.cancel_prefetch()
+        self.clear_error_list()
         self.clear_highlights()
         
-        text = self.text_area.get("1.0", tk.END).strip()
-        if not text:
+        start_time = time.perf_counter()
+        text = self.text_area.get("1.0", "end-1c")
+        fetch_seconds = time.perf_counter() - start_time
+        if not text.strip():
             self.status_label.config(text="Aucun texte à vérifier")
             self.progress_var.set(0)
-            self.correction_frame.configure(text="Corrections (0 erreur)")
             return
             
-        # Maintenant word_matches est un itérateur de MatchObject
-        word_matches = self.spell_manager.extract_words(text)
-        # Convertir en liste pour pouvoir compter
-        word_matches = list(word_matches)
-        total_words = len(word_matches)
-        misspelled = set()
-        corrections_made = 0
-        
-        # Position actuelle dans le texte
-        current_pos = "1.0"
-        
-        for i, match in enumerate(word_matches):
-            progress = (i / total_words) * 100
-            self.progress_var.set(progress)
-            self.status_label.config(text=f"Vérification : {i+1}/{total_words} mots")
-            self.root.update()
-            
-            # Extraire le mot et sa ponctuation
-            word = match.group(1)  # Le mot lui-même
-            punctuation = match.group(2)  # La ponctuation qui suit
-            
-            # Vérifier d'abord dans le dictionnaire personnel
-            correction_found = False
-            for correct_word, variants in self.dict_manager.corrections_perso.items():
-                # Vérifier le mot tel quel et en minuscules
-                if word in variants or word.lower() in variants:
-                    # Chercher et remplacer le mot dans le texte
-                    while True:
-                        pos = self.text_area.search(word + punctuation, current_pos, tk.END)
-                        if not pos:
-                            break
-                        
-                        word_end = f"{pos}+{len(word + punctuation)}c"
-                        # Vérifier que c'est un mot entier
-                        before = "" if pos == "1.0" else self.text_area.get(f"{pos}-1c", pos)
-                        
-                        if not before.isalpha():
-                            # Conserver la casse d'origine si le mot commence par une majuscule
-                            if word[0].isupper():
-                                replacement = correct_word.capitalize()
-                            else:
-                                replacement = correct_word.lower()
-                            self.text_area.delete(pos, word_end)
-                            self.text_area.insert(pos, replacement + punctuation)
-                            corrections_made += 1
-                        current_pos = word_end
-                    correction_found = True
-                    break
-            
-            if not correction_found and not self.spell_manager.check_word(word):
-                misspelled.add(word)
-                # Surligner uniquement le mot, pas la ponctuation
-                start_pos = "1.0"
-                while True:
-                    pos = self.text_area.search(word + punctuation, start_pos, tk.END)
-                    if not pos:
-                        break
-                    # Surligner seulement le mot, pas la ponctuation
-                    word_end = f"{pos}+{len(word)}c"
-                    self.text_area.tag_add("error", pos, word_end)
-                    start_pos = f"{pos}+{len(word + punctuation)}c"
+        # La vérification démarrera dès que les dictionnaires seront chargés
+        if self.spell_manager is None:
+            self.check_requested = True
+            self.status_label.config(text="Chargement des dictionnaires... La vérification démarrera ensuite")
+            return
+            
+        # Toute modification du texte pendant la vérification invalide les positions calculées
+        self.text_changed_during_check = False
+        self.corrections_made = 0
+        self.progress_var.set(0)
+        self.status_label.config(text="Vérification en cours...")
+        
+        self.instrumentation.begin_run("vérification")
+        self.instrumentation.record('lecture du texte', fetch_seconds, len(text))
+        self.check_worker = SpellCheckWorker(text, self.spell_manager, self.dict_manager,
+                                             instrumentation=self.instrumentation,
+                                             parallel_checker=self.get_parallel_checker())
+        self.check_worker.start()
+        self.root.after(self.CHECK_POLL_MS, self.poll_check, self.check_worker)
+        
+    def get_parallel_checker(self):
+        """Retourne le vérificateur parallèle des longs documents, ou None sur une machine à un seul processeur"""
+        if self.parallel_checker is None and (os.cpu_count() or 1) > 1:
+            # Import différé, comme celui du correcteur (voir EngineLoader)
+            from parallel_check import ParallelChecker
+            self.parallel_checker = ParallelChecker()
+        return self.parallel_checker
+        
+    def cancel_check(self):
+        """Annule la vérification en cours, s'il y en a une"""
+        if self.check_worker is not None:
+            self.check_worker.cancel()
+            self.check_worker = None
+        self.text_area.configure(state='normal')
+            
+    def poll_check(self, worker):
+        """Récupère les résultats transmis par le thread de vérification"""
+        if worker is not self.check_worker:
+            return
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == 'progression':
+                    _, done, total = message
+                    self.progress_var.set((done / total) * 100 if total else 100)
+                    self.status_label.config(text=f"Vérification : {done}/{total} mots")
+                    continue
+                if kind == 'lecture':
+                    _, done, total = message
+                    self.progress_var.set((done / total) * 100 if total else 100)
+                    self.status_label.config(text=f"Chargement : {done / 2**20:.1f}/{total / 2**20:.1f} Mo")
+                    continue
+                if kind == 'echec':
+                    self.check_worker = None
+                    self.instrumentation.end_run()
+                    self.text_area.configure(state='normal')
+                    self.status_label.config(text="")
+                    messagebox.showerror("Erreur", f"Erreur lors de {worker.ERROR_CONTEXT} : {message[1]}")
+                    return
+                # Le texte a été modifié par l'utilisateur : les positions ne sont plus valables
+                # (le texte d'un fichier en cours de chargement est en lecture seule)
+                if self.text_changed_during_check and not isinstance(worker, FileCheckWorker):
+                    self.check_spelling()
+                    return
+                if kind == 'morceau':
+                    _, chunk, corrections, new_lines = message
+                    self.corrections_made += corrections
+                    # Le texte est en lecture seule pendant le chargement
+                    self.text_area.configure(state='normal')
+                    self.tracking_suspended = True
+                    try:
+                        with self.instrumentation.phase('insertion du texte') as phase:
+                            self.text_area.insert("end-1c", chunk)
+                            phase.add(len(chunk))
+                    finally:
+                        self.tracking_suspended = False
+                        self.text_area.configure(state='disabled')
+                    self.error_index.append_lines(new_lines)
+                elif kind == 'texte':
+                    _, new_text, edits, total, line_count = message
+                    self.corrections_made = len(edits)
+                    # Un seul remplacement du contenu du widget pour toutes les corrections
+                    if edits:
+                        self.tracking_suspended = True
+                        try:
+                            with self.instrumentation.phase('insertion du texte') as phase:
+                                self.text_area.delete("1.0", tk.END)
+                                self.text_area.insert("1.0", new_text)
+                                phase.add(len(new_text))
+                        finally:
+                            self.tracking_suspended = False
+                    self.error_index.reset(line_count)
+                elif kind == 'erreurs':
+                    with self.instrumentation.phase('surlignage') as phase:
+                        self.error_index.add_errors(message[1])
+                        # Surligner uniquement les mots, pas la ponctuation
+                        if self.lazy_highlighting:
+                            self.invalidate_highlights()
+                        elif not self.highlights_hidden:
+                            for line, start, end, word in message[1]:
+                                self.text_area.tag_add("error", f"{line}.{start}", f"{line}.{end}")
+                        phase.add(len(message[1]))
+                elif kind == 'fin':
+                    self.check_worker = None
+                    self.text_area.configure(state='normal')
+                    if worker.spell_manager is None:
+                        self.instrumentation.end_run()
+                        # Fichier chargé avant les dictionnaires : la vérification démarre avec eux
+                        if self.spell_manager is not None:
+                            self.check_requested = False
+                            self.check_spelling()
+                        else:
+                            self.status_label.config(text="Chargement des dictionnaires... La vérification démarrera ensuite")
+                            self.progress_var.set(0)
+                        return
+                    self.finish_check(message[1])
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(self.CHECK_POLL_MS, self.poll_check, worker)
+        
+    def finish_check(self, tier_summary=""):
+        """Affiche le résultat de la vérification"""
+        corrections_made = self.corrections_made
+        
+        # Remplir la liste des erreurs en une seule fois
+        with self.instrumentation.phase('liste des erreurs') as phase:
+            self.error_index.take_touched()
+            self.error_words = sorted(self.error_index.counts)
+            self.error_listbox.delete(0, tk.END)
+            if self.error_words:
+                self.error_listbox.insert(tk.END, *self.error_words)
+            self.update_error_count()
+            phase.add(len(self.error_words))
+        self.start_prefetch()
                 
         # Afficher les statistiques
         status_text = []
         if corrections_made > 0:
             status_text.append(f"{corrections_made} corrections automatiques")
-        if misspelled:
-            status_text.append(f"{len(misspelled)} erreurs trouvées")
-            for word in sorted(misspelled):
-                self.error_listbox.insert(tk.END, word)
-            # Mettre à jour le titre du cadre de correction
-            self.correction_frame.configure(text=f"Corrections ({len(misspelled)} erreurs)")
-        else:
-            self.correction_frame.configure(text="Corrections (0 erreur)")
+        if self.error_words:
+            status_text.append(f"{len(self.error_words)} erreurs trouvées")
         
         if status_text:
-            self.status_label.config(text="Terminé : " + ", ".join(status_text))
+            status = "Terminé : " + ", ".join(status_text)
         else:
-            self.status_label.config(text="Terminé : Aucune erreur trouvée")
+            status = "Terminé : Aucune erreur trouvée"
+        if tier_summary:
+            status += f" (mots résolus par niveau : {tier_summary})"
+        # Durées relevées par l'instrumentation, si elle est activée
+        timing_summary = self.instrumentation.end_run()
+        if timing_summary:
+            status += f" | {timing_summary}"
+        self.status_label.config(text=status)
             
         self.progress_var.set(100)
 
+    def clear_error_list(self):
+        """Vide la liste des erreurs et l'index des erreurs par ligne"""
+        self.error_index.reset(int(self.text_area.index("end-1c").split(".")[0]))
+        self.error_index.take_touched()
+        self.error_words = []
+        self.error_listbox.delete(0, tk.END)
+        self.update_error_count()
+        
+    def update_error_count(self):
+        """Met à jour le titre du cadre des corrections avec le nombre d'erreurs"""
+        remaining_errors = len(self.error_words)
+        self.correction_frame.configure(text=f"Corrections ({remaining_errors} erreur{'s' if remaining_errors > 1 else ''})")
+        
+    def update_error_list(self):
+        """Ajoute ou retire de la liste les mots dont le nombre d'occurrences en erreur a changé"""
+        for word in self.error_index.take_touched():
+            present = word in self.error_index.counts
+            position = bisect.bisect_left(self.error_words, word)
+            listed = position < len(self.error_words) and self.error_words[position] == word
+            if present and not listed:
+                self.error_words.insert(position, word)
+                self.error_listbox.insert(position, word)
+                if self.suggestion_prefetcher is not None:
+                    self.suggestion_prefetcher.submit([word])
+            elif listed and not present:
+                del self.error_words[position]
+                self.error_listbox.delete(position)
+                if word == self.selected_error_word:
+                    self.selected_error_word = None
+                    self.selected_error_index = None
+                    self.forget_occurrence()
+        self.update_error_count()
+        
+    # Préchargement des suggestions
+    def start_prefetch(self):
+        """Lance le calcul en arrière-plan des suggestions de toutes les erreurs listées"""
+        self.cancel_prefetch()
+        if not self.error_words:
+            return
+        if self.dict_manager is not None:
+            # Les suggestions dépendent des mots du dictionnaire personnel
+            self.spell_manager.sync_dictionary(self.dict_manager)
+            self.prefetch_version = self.dict_manager.version
+        self.suggestion_prefetcher = SuggestionPrefetcher(self.spell_manager, workers=self.PREFETCH_WORKERS)
+        self.suggestion_prefetcher.submit(self.error_words)
+        self.prefetch_visible_errors(*self.error_listbox.yview())
+        self.suggestion_prefetcher.start()
+        
+    def cancel_prefetch(self):
+        """Abandonne le préchargement des suggestions de la vérification précédente"""
+        if self.suggestion_prefetcher is not None:
+            self.suggestion_prefetcher.cancel()
+            self.suggestion_prefetcher = None
+            
+    def on_error_list_scroll(self, first, last):
+        """Fait passer en priorité les erreurs qui deviennent visibles dans la liste"""
+        self.prefetch_visible_errors(first, last)
+        
+    def prefetch_visible_errors(self, first, last):
+        """Précharge d'abord les erreurs visibles dans la liste et les suivantes"""
+        if self.suggestion_prefetcher is None or not self.error_words:
+            return
+        count = len(self.error_words)
+        start = int(float(first) * count)
+        end = min(int(float(last) * count + 0.5) + self.PREFETCH_AHEAD, count)
+        self.suggestion_prefetcher.prioritize(self.error_words[start:end])
+        
+    def get_suggestions(self, word):
+        """Retourne les suggestions d'un mot, depuis le préchargement si possible"""
+        with self.instrumentation.phase('get_suggestions') as phase:
+            phase.add(1)
+            if self.suggestion_prefetcher is not None:
+                return self.suggestion_prefetcher.get(word)
+            return self.spell_manager.get_suggestions(word)
+        
+    # Suivi des modifications du texte
+    def install_text_tracker(self):
+        """Intercepte les commandes insert/delete/replace du widget texte pour suivre les lignes modifiées"""
+        widget = self.text_area._w
+        self.text_area_command = widget + "_orig"
+        self.root.tk.call("rename", widget, self.text_area_command)
+        self.root.tk.createcommand(widget, self.text_proxy)
+        self.text_area.bind("<<Modified>>", self.on_text_modified)
+        
+    def text_line(self, index):
+        """Retourne le numéro de ligne d'un index du widget texte (avant interception)"""
+        return int(self.root.tk.call(self.text_area_command, "index", index).split(".")[0])
+        
+    def text_proxy(self, *args):
+        """Exécute une commande du widget texte en notant les lignes qu'elle modifie"""
+        call = self.root.tk.call
+        command = self.text_area_command
+        if self.tracking_suspended or not args or args[0] not in ("insert", "delete", "replace"):
+            return call((command,) + args)
+        
+        last_line = self.text_line("end-1c")
+        if args[0] == "insert":
+            line = min(self.text_line(args[1]), last_line)
+            result = call((command,) + args)
+            self.error_index.on_insert(line, "".join(args[2::2]).count("\n"))
+        else:
+            first_line = self.text_line(args[1])
+            end_index = args[2] if len(args) > 2 else f"{args[1]}+1c"
+            last_changed = min(self.text_line(end_index), last_line)
+            result = call((command,) + args)
+            if last_changed >= first_line:
+                self.error_index.on_delete(first_line, last_changed)
+                if args[0] == "replace":
+                    self.error_index.on_insert(first_line, "".join(args[3::2]).count("\n"))
+        if self.check_worker is not None:
+            self.text_changed_during_check = True
+        # Les numéros des lignes surlignées ont changé
+        if self.error_index.line_count() != last_line:
+            self.invalidate_highlights()
+        return result
+        
+    def on_text_modified(self, event=None):
+        """Déclenche la revérification des lignes modifiées"""
+        if not self.text_area.edit_modified():
+            return
+        self.text_area.edit_modified(False)
+        self.schedule_recheck()
+        
+    def schedule_recheck(self):
+        """Programme la revérification des lignes modifiées"""
+        if (not self.recheck_pending and self.check_worker is None and self.spell_manager is not None
+                and self.error_index.dirty):
+            self.recheck_pending = True
+            self.root.after(self.RECHECK_DELAY_MS, self.recheck_dirty_lines)
+            
+    def recheck_dirty_lines(self):
+        """Revérifie un lot de lignes modifiées et met à jour leurs surlignages"""
+        self.recheck_pending = False
+        if self.check_worker is not None:
+            return
+        line_count = self.error_index.line_count()
+        for line in self.error_index.take_dirty(self.RECHECK_BATCH_LINES):
+            if line > line_count:
+                continue
+            start, end = f"{line}.0", f"{line}.end"
+            errors = check_line(self.text_area.get(start, end), self.spell_manager, self.dict_manager)
+            self.error_index.set_line_errors(line, errors)
+            self.tag_line_errors(line)
+        self.update_error_list()
+        self.schedule_recheck()
+
+    # Chargement différé des dictionnaires
+    def start_engine_loading(self):
+        """Lance le chargement du correcteur et des dictionnaires dans un thread séparé"""
+        self.status_label.config(text="Chargement des dictionnaires...")
+        self.progress_bar.configure(mode='indeterminate')
+        self.progress_bar.start()
+        self.engine_loader = EngineLoader(suggestion_backend='symspell', suggestion_cache=SuggestionCache())
+        self.engine_loader.start()
+        self.root.after(self.ENGINE_POLL_MS, self.poll_engine_loading)
+        
+    def poll_engine_loading(self):
+        """Récupère le résultat du chargement des dictionnaires"""
+        try:
+            message = self.engine_loader.queue.get_nowait()
+        except queue.Empty:
+            self.root.after(self.ENGINE_POLL_MS, self.poll_engine_loading)
+            return
+        self.engine_loader = None
+        self.progress_bar.stop()
+        self.progress_bar.configure(mode='determinate')
+        self.progress_var.set(0)
+        if message[0] == 'echec':
+            self.status_label.config(text="Échec du chargement des dictionnaires")
+            messagebox.showerror("Erreur", f"Erreur lors du chargement des dictionnaires : {message[1]}")
+            return
+        _, self.spell_manager, self.dict_manager, timings = message
+        self.startup_timings.update(timings)
+        self.startup_timings['prêt'] = time.perf_counter() - self.started_at
+        self.log_startup_timings()
+        
+        self.status_label.config(text="Dictionnaires chargés")
+        self.refresh_dict()
+        self.update_dict_title()
+        self.report_dict_conflicts()
+        # Un fichier en cours de chargement sera vérifié à la fin de sa lecture
+        if self.check_requested and self.check_worker is None:
+            self.check_requested = False
+            self.check_spelling()
+        else:
+            self.schedule_recheck()
+            
+    def log_startup_timings(self):
+        """Affiche la durée de chaque phase du démarrage (et la relève dans la trace avec --trace)"""
+        for phase, seconds in self.startup_timings.items():
+            print(f"Démarrage - {phase} : {seconds * 1000:.0f} ms")
+            self.instrumentation.record(f"démarrage : {phase}", seconds)
+            
+    def on_close(self):
+        """Annule la vérification en cours et ferme la fenêtre"""
+        self.cancel_check()
+        self.cancel_prefetch()
+        if self.parallel_checker is not None:
+            self.parallel_checker.close()
+        if self.spell_manager is not None and self.spell_manager.suggestion_cache is not None:
+            self.spell_manager.suggestion_cache.close()
+        # Réécrire le fichier trié à partir du journal des modifications
+        if self.dict_manager is not None:
+            with self.instrumentation.phase('sauvegarde du dictionnaire') as phase:
+                self.dict_manager.close()
+                phase.add(self.dict_manager.get_correction_count())
+        self.root.destroy()
+        if self.dict_manager is not None:
+            # Le fichier trié vient d'être réécrit : enregistrer l'instantané compilé du dictionnaire
+            # (une fois la fenêtre fermée) pour que le prochain démarrage n'ait pas à le recompiler
+            from dictionary_snapshot import save_personal_snapshot
+            with self.instrumentation.phase('instantané du dictionnaire'):
+                try:
+                    save_personal_snapshot(self.dict_manager)
+                except OSError as e:
+                    print(f"Impossible d'enregistrer l'instantané du dictionnaire : {e}")
+
+    def report_dict_conflicts(self):
+        """Signale les variantes revendiquées par plusieurs corrections"""
+        conflicts = self.dict_manager.get_conflicts()
+        if not conflicts:
+            return
+        for variante, corrections in sorted(conflicts.items()):
+            print(f"Conflit : '{variante}' est une variante de {', '.join(corrections)} (retenu : '{corrections[0]}')")
+        self.status_label.config(text=f"Attention : {len(conflicts)} variantes revendiquées par plusieurs corrections")
+
+    # Surlignage des erreurs
+    def tag_line_errors(self, line):
+        """Surligne les erreurs d'une ligne (si elle est dans la zone surlignée en mode paresseux)"""
+        self.text_area.tag_remove("error", f"{line}.0", f"{line}.end")
+        if self.highlights_hidden:
+            return
+        if self.lazy_highlighting:
+            if self.highlighted_range is None:
+                return
+            first, last = self.highlighted_range
+            if not first <= line <= last:
+                return
+        for start, end, _ in self.error_index.line_errors(line):
+            self.text_area.tag_add("error", f"{line}.{start}", f"{line}.{end}")
+            
+    def on_text_scroll(self, first, last):
+        """Met à jour la barre de défilement et les surlignages de la zone visible"""
+        self.text_area.vbar.set(first, last)
+        if self.lazy_highlighting:
+            self.schedule_highlight_refresh()
+            
+    def invalidate_highlights(self):
+        """Force le surlignage complet de la zone visible au prochain rafraîchissement"""
+        self.highlighted_range = None
+        if self.lazy_highlighting:
+            self.schedule_highlight_refresh()
+            
+    def schedule_highlight_refresh(self):
+        if not self.highlight_pending:
+            self.highlight_pending = True
+            self.root.after_idle(self.refresh_visible_highlights)
+            
+    def refresh_visible_highlights(self):
+        """Surligne les erreurs des lignes visibles (plus une marge) à partir de l'index des erreurs"""
+        self.highlight_pending = False
+        if self.highlights_hidden:
+            return
+        line_count = self.error_index.line_count()
+        first = max(1, self.text_line("@0,0") - self.VIEWPORT_MARGIN_LINES)
+        last = min(line_count, self.text_line(f"@0,{self.text_area.winfo_height()}") + self.VIEWPORT_MARGIN_LINES)
+        if (first, last) == self.highlighted_range:
+            return
+        self.text_area.tag_remove("error", "1.0", tk.END)
+        for line in range(first, last + 1):
+            for start, end, _ in self.error_index.line_errors(line):
+                self.text_area.tag_add("error", f"{line}.{start}", f"{line}.{end}")
+        self.highlighted_range = (first, last)
+        
     def clear_highlights(self):
-        """Efface tous les surlignages"""
+        """Efface tous les surlignages avant une nouvelle vérification"""
         self.text_area.tag_remove("error", "1.0", tk.END)
         self.text_area.tag_remove("selected", "1.0", tk.END)
+        self.highlighted_range = None
+        self.highlights_hidden = False
+        
+    def hide_highlights(self):
+        """Efface tous les surlignages, qui ne reviennent pas au défilement ni à la saisie avant la prochaine vérification"""
+        self.clear_highlights()
+        self.highlights_hidden = True
         
     def highlight_word(self, word):
         """Surligne toutes les occurrences d'un mot"""
-        start_pos = "1.0"
-        while True:
-            start_pos = self.text_area.search(word, start_pos, tk.END)
-            if not start_pos:
-                break
-            # Ne surligner que le mot, pas la ponctuation qui suit
-            base_word = re.match(r'[a-zA-ZÀ-ÿ]+', word).group(0)
-            end_pos = f"{start_pos}+{len(base_word)}c"
-            self.text_area.tag_add("error", start_pos, end_pos)
-            start_pos = end_pos
-            
+        self.tag_occurrences("error", self.error_index.occurrences(word))
+        
+    def tag_occurrences(self, tag, positions):
+        """Applique un tag à des positions [(ligne, colonne_début, colonne_fin)] en un seul appel"""
+        if not positions:
+            return
+        ranges = []
+        for line, start, end in positions:
+            ranges.extend((f"{line}.{start}", f"{line}.{end}"))
+        self.text_area.tag_add(tag, *ranges)
+        
     def on_select_error(self, event):
         """Gère la sélection d'une erreur"""
         selection = self.error_listbox.curselection()
@@ -326,7 +783,7 @@ class SpellCheckerGUI:
         # Affiche les suggestions pour ce mot
         word = self.error_listbox.get(selection[0])
         self.suggestions_listbox.delete(0, tk.END)
-        suggestions = self.spell_manager.get_suggestions(word)
+        suggestions = self.get_suggestions(word)
         for suggestion in suggestions:
             self.suggestions_listbox.insert(tk.END, suggestion)
             
@@ -334,7 +791,7 @@ class SpellCheckerGUI:
         self.highlight_selected_word(word)
 
     def on_suggestion_select(self, event):
-        """Gère la sélection d'une suggestion"""
+        """Gère la sélection d'une suggestion : remplace l'occurrence courante du mot erroné"""
         print("Suggestion sélectionnée")
         
         # Vérifie si une suggestion est sélectionnée
@@ -354,50 +811,28 @@ class SpellCheckerGUI:
         print(f"Mot à corriger: '{self.selected_error_word}'")
         print(f"Suggestion: '{suggestion}'")
         
-        # Trouve la position du mot dans le texte
-        start_pos = "1.0"
-        found = False
-        while True:
-            pos = self.text_area.search(self.selected_error_word, start_pos, tk.END)
-            if not pos:
-                print(f"Mot '{self.selected_error_word}' non trouvé dans le texte")
-                break
-                
-            print(f"Mot trouvé à la position: {pos}")
-            # Calcule la position de fin du mot
-            end_pos = f"{pos}+{len(self.selected_error_word)}c"
-            
-            # Vérifie si ce mot est surligné
-            tags = self.text_area.tag_names(pos)
-            print(f"Tags à cette position: {tags}")
-            
-            if "error" in tags:
-                print("Tag 'error' trouvé, remplacement du mot...")
-                # Remplace le mot
-                self.text_area.delete(pos, end_pos)
-                self.text_area.insert(pos, suggestion)
-                # Retire le tag d'erreur
-                self.text_area.tag_remove("error", pos, f"{pos}+{len(suggestion)}c")
-                found = True
-                break
-                
-            start_pos = end_pos
-            
-        if found:
-            print("Mot remplacé avec succès")
-            # Supprime le mot de la liste des erreurs
-            self.error_listbox.delete(self.selected_error_index)
-            
-            # Met à jour le titre du cadre des corrections
-            remaining_errors = self.error_listbox.size()
-            self.correction_frame.configure(text=f"Corrections ({remaining_errors} erreur{'s' if remaining_errors > 1 else ''})")
-            
-            # Efface la liste des suggestions et réinitialise la sélection
-            self.suggestions_listbox.delete(0, tk.END)
-            self.selected_error_word = None
-            self.selected_error_index = None
-        else:
+        # L'occurrence courante, si elle est toujours en erreur, sinon la première
+        positions = self.error_index.occurrences(self.selected_error_word)
+        if not positions:
+            print(f"Mot '{self.selected_error_word}' non trouvé dans le texte")
             print("Échec du remplacement du mot")
+            return
+        current = self.current_occurrence()
+        line, start, end = next((position for position in positions if position[:2] == current), positions[0])
+        pos = f"{line}.{start}"
+        print(f"Mot trouvé à la position: {pos}")
+        
+        # Remplace le mot ; la ligne modifiée est revérifiée et le mot quitte la liste des erreurs s'il n'a plus d'occurrence
+        self.text_area.delete(pos, f"{line}.{end}")
+        self.text_area.insert(pos, suggestion)
+        print("Mot remplacé avec succès")
+        
+        # Efface la liste des suggestions et réinitialise la sélection
+        self.suggestions_listbox.delete(0, tk.END)
+        self.text_area.tag_remove("selected", "1.0", tk.END)
+        self.selected_error_word = None
+        self.selected_error_index = None
+        self.forget_occurrence()
             
     def apply_correction(self):
         """Applique la correction sélectionnée"""
@@ -411,34 +846,61 @@ class SpellCheckerGUI:
         correction = self.suggestions_listbox.get(suggestion_selection[0])
         
         # Mettre à jour le texte
-        text = self.text_area.get(1.0, tk.END)
-        new_text = text.replace(incorrect_word, correction)
-        
-        self.text_area.delete(1.0, tk.END)
-        self.text_area.insert(1.0, new_text)
-        
-        # Supprimer le mot de la liste des erreurs
-        self.error_listbox.delete(error_selection[0])
-        
-        # Mettre à jour le titre avec le nouveau nombre d'erreurs
-        remaining_errors = self.error_listbox.size()
-        self.correction_frame.configure(text=f"Corrections ({remaining_errors} erreurs)")
-        
-        # Relancer la vérification orthographique
-        self.check_spelling()
+        self.replace_occurrences(incorrect_word, correction)
+        # Les lignes modifiées sont revérifiées et la liste des erreurs mise à jour automatiquement
+        
+    def replace_occurrences(self, word, replacement):
+        """Remplace les occurrences en erreur d'un mot, aux positions de l'index, et retourne leur nombre
+        
+        Seuls les mots eux-mêmes sont réécrits (pas les chaînes identiques à l'intérieur d'autres mots) :
+        le reste du texte, la position de défilement et les surlignages des autres lignes sont conservés.
+        """
+        with self.instrumentation.phase('remplacement') as phase:
+            positions = self.error_index.occurrences(word)
+            # De la fin vers le début : un remplacement ne décale pas les positions qui le précèdent
+            for line, start, end in reversed(positions):
+                self.text_area.replace(f"{line}.{start}", f"{line}.{end}", replacement)
+            phase.add(len(positions))
+        return len(positions)
 
     def highlight_selected_word(self, word):
-        """Met en évidence le mot sélectionné"""
-        start_pos = "1.0"
-        while True:
-            start_pos = self.text_area.search(word, start_pos, tk.END)
-            if not start_pos:
-                break
-            # Surligner seulement le mot, pas la ponctuation
-            word_end = f"{start_pos}+{len(word)}c"
-            self.text_area.tag_add("selected", start_pos, word_end)
-            self.text_area.see(start_pos)
-            start_pos = f"{start_pos}+{len(word)}c"
+        """Met en évidence toutes les occurrences du mot sélectionné et affiche la première"""
+        self.text_area.tag_remove("selected", "1.0", tk.END)
+        positions = self.error_index.occurrences(word)
+        self.tag_occurrences("selected", positions)
+        self.forget_occurrence()
+        if positions:
+            self.show_occurrence(positions[0])
+            
+    def show_occurrence(self, occurrence):
+        """Place le curseur sur une occurrence et la fait défiler à l'écran"""
+        line, start, _ = occurrence
+        # Repère qui suit les modifications du texte, à gauche du mot
+        self.text_area.mark_set(self.OCCURRENCE_MARK, f"{line}.{start}")
+        self.text_area.mark_gravity(self.OCCURRENCE_MARK, tk.LEFT)
+        self.text_area.mark_set(tk.INSERT, f"{line}.{start}")
+        self.text_area.see(f"{line}.{start}")
+        
+    def current_occurrence(self):
+        """Retourne (ligne, colonne) de l'occurrence courante, ou None"""
+        if self.OCCURRENCE_MARK not in self.text_area.mark_names():
+            return None
+        line, column = self.text_area.index(self.OCCURRENCE_MARK).split(".")
+        return int(line), int(column)
+        
+    def forget_occurrence(self):
+        """Oublie l'occurrence courante"""
+        if self.OCCURRENCE_MARK in self.text_area.mark_names():
+            self.text_area.mark_unset(self.OCCURRENCE_MARK)
+            
+    def goto_next_occurrence(self):
+        """Passe à l'occurrence suivante du mot sélectionné (en reprenant au début du texte)"""
+        if self.selected_error_word is None:
+            return
+        line, start = self.current_occurrence() or (0, 0)
+        occurrence = self.error_index.next_occurrence(self.selected_error_word, line, start)
+        if occurrence is not None:
+            self.show_occurrence(occurrence)
             
     # Méthodes de gestion du dictionnaire
     def add_to_dict(self):
@@ -451,7 +913,6 @@ class SpellCheckerGUI:
             correction = self.suggestions_listbox.get(sugg_sel[0])
             
             self.dict_manager.add_correction(correction, variante)
-            self.dict_manager.save_custom_corrections(self.dict_manager.corrections_perso)
             
             self.refresh_dict()
             self.update_dict_title()
@@ -468,54 +929,101 @@ class SpellCheckerGUI:
             # Demander confirmation avant la suppression
             if messagebox.askyesno("Confirmation", f"Voulez-vous vraiment supprimer '{correction}' et toutes ses variantes du dictionnaire ?"):
                 self.dict_manager.remove_correction(correction)
-                self.dict_manager.save_custom_corrections(self.dict_manager.corrections_perso)
                 
                 self.refresh_dict()
                 self.update_dict_title()
                 messagebox.showinfo("Succès", f"'{correction}' et ses variantes ont été supprimés du dictionnaire")
             
     def refresh_dict(self):
-        """Rafraîchit l'affichage du dictionnaire"""
-        for item in self.dict_tree.get_children():
-            self.dict_tree.delete(item)
-        
-        # Créer une liste triée des corrections (insensible à la casse)
-        corrections_triees = sorted(self.dict_manager.corrections_perso.items(), 
-                                  key=lambda x: unidecode(x[0]).lower())
-        
-        for correction, variantes in corrections_triees:
-            # Trier les variantes
-            variantes_triees = sorted(variantes)
-            
-            # Formater les variantes sur plusieurs lignes
-            variantes_formatees = []
-            ligne_courante = []
-            longueur_courante = 0
-            
-            for variante in variantes_triees:
-                # Ajouter la longueur de la variante plus la virgule et l'espace
-                longueur_variante = len(variante) + 2
-                
-                # Si l'ajout de cette variante dépasse ~80 caractères, commencer une nouvelle ligne
-                if longueur_courante + longueur_variante > 80 and ligne_courante:
-                    variantes_formatees.append(", ".join(ligne_courante))
-                    ligne_courante = []
-                    longueur_courante = 0
-                
-                ligne_courante.append(variante)
-                longueur_courante += longueur_variante
-            
-            # Ajouter la dernière ligne si elle n'est pas vide
-            if ligne_courante:
-                variantes_formatees.append(", ".join(ligne_courante))
+        """Rafraîchit l'affichage du dictionnaire (seules les entrées modifiées sont recalculées)"""
+        if self.dict_manager is None:
+            return
+        with self.instrumentation.phase('refresh_dict') as phase:
+            changed = self.dict_view.sync(self.dict_manager.corrections_perso, self.dict_manager.take_changes())
+            self.render_dict_window(changed)
+            phase.add(len(changed))
+        if self.suggestion_prefetcher is not None and self.dict_manager.version != self.prefetch_version:
+            # Suggestions préchargées avec l'ancien dictionnaire : les recalculer
+            self.start_prefetch()
+        
+    def render_dict_window(self, changed=()):
+        """Affiche les lignes de la fenêtre courante en ne modifiant que les lignes qui changent
+
+        Chaque ligne a pour identifiant sa correction ; changed contient les corrections
+        dont le texte a été modifié depuis le dernier affichage.
+        """
+        total = len(self.dict_view)
+        self.dict_offset = max(0, min(self.dict_offset, total - self.dict_window_rows))
+        rows = self.dict_view.rows(self.dict_offset, self.dict_window_rows)
+        wanted = {correction for correction, _ in rows}
+        obsolete = [item for item in self.dict_tree.get_children() if item not in wanted]
+        if obsolete:
+            self.dict_tree.delete(*obsolete)
+        for index, (correction, variantes_str) in enumerate(rows):
+            if not self.dict_tree.exists(correction):
+                self.dict_tree.insert('', index, iid=correction, values=(correction, variantes_str))
+                continue
+            if correction in changed:
+                self.dict_tree.item(correction, values=(correction, variantes_str))
+            if self.dict_tree.index(correction) != index:
+                self.dict_tree.move(correction, '', index)
+        
+        if total:
+            self.dict_scrollbar.set(self.dict_offset / total, min(1.0, (self.dict_offset + len(rows)) / total))
+        else:
+            self.dict_scrollbar.set(0.0, 1.0)
             
-            # Joindre toutes les lignes avec un retour à la ligne
-            variantes_str = "\n".join(variantes_formatees)
+    def scroll_dict(self, rows):
+        """Fait défiler le dictionnaire de rows lignes"""
+        self.dict_offset += rows
+        self.render_dict_window()
+        return "break"
+        
+    def on_dict_scrollbar(self, action, amount, unit=None):
+        """Traduit les commandes de la barre de défilement en position de la fenêtre de lignes"""
+        if action == "moveto":
+            self.dict_offset = int(float(amount) * len(self.dict_view))
+            self.render_dict_window()
+        elif unit == "pages":
+            self.scroll_dict(int(amount) * self.dict_window_rows)
+        else:
+            self.scroll_dict(int(amount))
             
-            self.dict_tree.insert('', 'end', values=(correction, variantes_str))
+    def on_dict_mouse_wheel(self, event):
+        """Molette de la souris (Windows, macOS)"""
+        return self.scroll_dict(-3 if event.delta > 0 else 3)
+        
+    def on_dict_arrow_key(self, step):
+        """Déplace la sélection d'une ligne, en faisant défiler la fenêtre aux extrémités"""
+        selection = self.dict_tree.selection()
+        if not selection:
+            return None
+        index = self.dict_view.index_of(selection[0])
+        if index is None or not 0 <= index + step < len(self.dict_view):
+            return "break"
+        index += step
+        if not self.dict_offset <= index < self.dict_offset + self.dict_window_rows:
+            self.dict_offset += step
+            self.render_dict_window()
+        correction = self.dict_view.correction_at(index)
+        self.dict_tree.selection_set(correction)
+        self.dict_tree.focus(correction)
+        return "break"
+        
+    def on_dict_tree_configure(self, event=None):
+        """Ajuste le nombre de lignes affichées à la hauteur du tableau"""
+        children = self.dict_tree.get_children()
+        bbox = self.dict_tree.bbox(children[0]) if children else None
+        heading_height = bbox[1] if bbox else self.DICT_HEADING_HEIGHT
+        rows = max(1, (self.dict_tree.winfo_height() - heading_height) // int(self.current_row_height))
+        if rows != self.dict_window_rows:
+            self.dict_window_rows = rows
+            self.render_dict_window()
             
     def get_dict_title(self):
         """Retourne le titre du cadre du dictionnaire"""
+        if self.dict_manager is None:
+            return "Dictionnaire Personnel (chargement...)"
         nb_mots = self.dict_manager.get_correction_count()
         return f"Dictionnaire Personnel ({nb_mots} mots)"
         
@@ -524,13 +1032,11 @@ class SpellCheckerGUI:
         self.dict_frame.configure(text=self.get_dict_title())
         
     def treeview_sort_column(self, col, reverse):
-        """Trie une colonne du Treeview"""
-        l = [(unidecode(self.dict_tree.set(k, col)).lower(), k) for k in self.dict_tree.get_children('')]
-        l.sort(reverse=reverse)
+        """Trie une colonne du Treeview (clés de tri en cache)"""
+        self.dict_view.sort(col, reverse)
+        self.dict_offset = 0
+        self.render_dict_window()
         
-        for index, (_, k) in enumerate(l):
-            self.dict_tree.move(k, '', index)
-            
         self.dict_tree.heading(col, command=lambda: self.treeview_sort_column(col, not reverse))
 
     def start_resize(self, event):
@@ -554,6 +1060,7 @@ class SpellCheckerGUI:
             style = ttk.Style()
             style.configure("Treeview", rowheight=int(new_height))
             self.current_row_height = new_height
+            self.on_dict_tree_configure()
 
     def end_resize(self, event):
         """Termine le redimensionnement des lignes"""
@@ -608,24 +1115,12 @@ class SpellCheckerGUI:
         
         # Ajouter le mot erroné comme variante
         self.dict_manager.add_correction(correction, incorrect_word)
-        self.dict_manager.save_custom_corrections(self.dict_manager.corrections_perso)
         print(f"Ajout de la variante {incorrect_word} pour {correction}")
         
-        # Appliquer la correction dans le texte
-        text = self.text_area.get(1.0, tk.END)
-        new_text = text.replace(incorrect_word, correction)
-        
-        self.text_area.delete(1.0, tk.END)
-        self.text_area.insert(1.0, new_text)
+        # Appliquer la correction dans le texte (les lignes modifiées sont revérifiées)
+        self.replace_occurrences(incorrect_word, correction)
         print("Correction appliquée dans le texte")
         
-        # Supprimer le mot de la liste des erreurs
-        self.error_listbox.delete(error_sel[0])
-        
-        # Mettre à jour le titre avec le nouveau nombre d'erreurs
-        remaining_errors = self.error_listbox.size()
-        self.correction_frame.configure(text=f"Corrections ({remaining_errors} erreurs)")
-        
         # Rafraîchir l'affichage du dictionnaire
         self.refresh_dict()
         print("Dictionnaire rafraîchi")
@@ -658,12 +1153,15 @@ class SpellCheckerGUI:
                 current_pos = self.text_area.index("insert")
                 self.text_area.insert(current_pos, mot_correct)
                 self.text_area.see(current_pos)  # S'assurer que le mot inséré est visible
-                self.check_spelling()  # Relancer la vérification orthographique
+                # La ligne modifiée est revérifiée automatiquement
             except Exception as e:
                 messagebox.showerror("Erreur", f"Impossible d'insérer le mot : {str(e)}")
 
     def show_add_word_dialog(self):
         """Affiche une boîte de dialogue pour ajouter un mot au dictionnaire"""
+        if self.dict_manager is None:
+            messagebox.showinfo("Information", "Les dictionnaires sont en cours de chargement, veuillez patienter.")
+            return
         dialog = tk.Toplevel(self.root)
         dialog.title("Ajouter un mot au dictionnaire")
         dialog.geometry("400x200")
@@ -696,14 +1194,11 @@ class SpellCheckerGUI:
             if messagebox.askyesno("Confirmation", 
                                  f"Voulez-vous ajouter le mot '{correct}' avec la variante '{variant}' au dictionnaire ?"):
                 try:
-                    # Ajouter au dictionnaire
+                    # Ajouter au dictionnaire (la modification est journalisée sur disque)
                     self.dict_manager.add_correction(correct, variant)
-                    # Sauvegarder les modifications
-                    self.dict_manager.save_custom_corrections(self.dict_manager.corrections_perso)
-                    # Recharger le dictionnaire
-                    self.dict_manager.corrections_perso = self.dict_manager.load_custom_corrections()
                     # Mettre à jour l'affichage
                     self.refresh_dict()
+                    self.report_dict_conflicts()
                     # Fermer la boîte de dialogue
                     dialog.destroy()
                     # Afficher un message de succès
@@ -768,21 +1263,12 @@ class SpellCheckerGUI:
             if messagebox.askyesno("Confirmation", 
                                  f"Voulez-vous modifier le mot '{mot_correct}' en '{new_correct}' avec les nouvelles variantes ?"):
                 try:
-                    # Supprimer l'ancienne entrée
-                    if mot_correct in self.dict_manager.corrections_perso:
-                        del self.dict_manager.corrections_perso[mot_correct]
-                    
-                    # Ajouter la nouvelle entrée avec ses variantes
-                    self.dict_manager.corrections_perso[new_correct] = new_variants
-                    
-                    # Sauvegarder les modifications
-                    self.dict_manager.save_custom_corrections(self.dict_manager.corrections_perso)
-                    
-                    # Recharger le dictionnaire
-                    self.dict_manager.corrections_perso = self.dict_manager.load_custom_corrections()
+                    # Remplacer l'ancienne entrée par la nouvelle (index des variantes compris, modification journalisée sur disque)
+                    self.dict_manager.update_correction(mot_correct, new_correct, new_variants)
                     
                     # Mettre à jour l'affichage
                     self.refresh_dict()
+                    self.report_dict_conflicts()
                     
                     # Fermer la boîte de dialogue
                     dialog.destroy()
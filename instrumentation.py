@@ -0,0 +1,188 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class PhaseTimer:
+    """Mesure d'une phase (voir Instrumentation.phase) ; add compte les éléments traités"""
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.count = 0
+        self.start_time = None
+
+    def add(self, count):
+        self.count += count
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.record(self.name, time.perf_counter() - self.start_time, self.count)
+        return False
+
+
+class NullPhase:
+    """Phase d'une instrumentation désactivée : ne mesure rien"""
+    def add(self, count):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class Instrumentation:
+    """Durées et compteurs des phases de la correction, relevés seulement sur demande
+
+    Les phases d'une vérification (begin_run ... end_run) sont cumulées par nom, quel que
+    soit le thread qui les mesure. Chaque vérification, et chaque phase mesurée en dehors
+    d'une vérification (suggestions, dictionnaire...), est ajoutée comme une ligne JSON au
+    fichier de trace. Sur demande, une vérification est aussi profilée avec cProfile
+    (fichier .prof, lisible avec pstats ou snakeviz) et suivie avec tracemalloc (pic de
+    mémoire et principales lignes d'allocation dans la trace, instantané .tracemalloc).
+    Désactivée, chaque phase ne coûte qu'un appel de méthode.
+    """
+    TOP_ALLOCATIONS = 10  # Lignes d'allocation reportées dans la trace
+
+    def __init__(self, trace_file=None, profile=False, memory=False, enabled=None):
+        self.trace_file = trace_file
+        self.profile = profile
+        self.memory = memory
+        self.enabled = bool(trace_file or profile or memory) if enabled is None else enabled
+        self.lock = threading.Lock()
+        self.run = None  # Vérification en cours : {'nom', 'debut', 'phases'}
+        self.run_count = 0
+        self.profiles = []  # Profils cProfile des threads de la vérification en cours
+        self.last_summary = ""
+
+    def phase(self, name):
+        """Contexte qui mesure une phase : with instrumentation.phase('tokenisation') as phase: ..."""
+        if not self.enabled:
+            return NULL_PHASE
+        return PhaseTimer(self, name)
+
+    def record(self, name, seconds, count=0):
+        """Ajoute la durée d'une phase à la vérification en cours, ou l'écrit seule dans la trace"""
+        if not self.enabled:
+            return
+        with self.lock:
+            if self.run is not None:
+                totals = self.run['phases'].setdefault(name, {'secondes': 0.0, 'appels': 0, 'elements': 0})
+                totals['secondes'] += seconds
+                totals['appels'] += 1
+                totals['elements'] += count
+                return
+        self._write({'type': 'operation', 'date': self._now(), 'phase': name,
+                     'secondes': round(seconds, 6), 'elements': count})
+
+    def begin_run(self, name):
+        """Commence le relevé d'une vérification"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.run_count += 1
+            self.run = {'nom': name, 'numero': self.run_count, 'debut': time.perf_counter(), 'phases': {}}
+            self.profiles = []
+        if self.memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+
+    @contextmanager
+    def profiled(self):
+        """Contexte qui profile le thread courant avec cProfile pendant la vérification en cours"""
+        if not self.profile or self.run is None:
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Un autre profileur est déjà actif (un seul à la fois depuis Python 3.12)
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self.lock:
+                self.profiles.append(profile)
+
+    def end_run(self):
+        """Termine le relevé de la vérification en cours, l'écrit dans la trace et retourne son résumé"""
+        if not self.enabled or self.run is None:
+            return ""
+        with self.lock:
+            run, self.run = self.run, None
+            profiles, self.profiles = self.profiles, []
+        total = time.perf_counter() - run['debut']
+        entry = {'type': 'verification', 'date': self._now(), 'nom': run['nom'], 'numero': run['numero'],
+                 'secondes': round(total, 6),
+                 'phases': {name: dict(values, secondes=round(values['secondes'], 6))
+                            for name, values in run['phases'].items()}}
+        if profiles:
+            entry['profil'] = self._dump_profiles(profiles, run['numero'])
+        if self.memory and tracemalloc.is_tracing():
+            entry['memoire'] = self._memory_report(run['numero'])
+        self._write(entry)
+        self.last_summary = self.summary(entry)
+        return self.last_summary
+
+    @staticmethod
+    def summary(entry, limit=4):
+        """Résumé court d'une vérification : durée totale et phases les plus longues"""
+        phases = sorted(entry['phases'].items(), key=lambda item: -item[1]['secondes'])[:limit]
+        details = ", ".join(f"{name} {values['secondes'] * 1000:.0f} ms" for name, values in phases)
+        summary = f"{entry['secondes'] * 1000:.0f} ms"
+        return f"{summary} ({details})" if details else summary
+
+    def _base_name(self, number):
+        base = os.path.splitext(self.trace_file)[0] if self.trace_file else "trace"
+        return f"{base}-{number}"
+
+    def _dump_profiles(self, profiles, number):
+        """Fusionne les profils des threads et les enregistre, retourne le chemin du fichier"""
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        path = f"{self._base_name(number)}.prof"
+        stats.dump_stats(path)
+        return path
+
+    def _memory_report(self, number):
+        """Pic de mémoire et principales lignes d'allocation depuis begin_run"""
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        path = f"{self._base_name(number)}.tracemalloc"
+        snapshot.dump(path)
+        top = snapshot.statistics('lineno')[:self.TOP_ALLOCATIONS]
+        return {'octets': current, 'pic_octets': peak, 'instantane': path,
+                'allocations': [{'ligne': str(stat.traceback), 'octets': stat.size, 'blocs': stat.count}
+                                for stat in top]}
+
+    def _write(self, entry):
+        if not self.trace_file:
+            return
+        try:
+            with open(self.trace_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Impossible d'écrire la trace {self.trace_file} : {e}")
+
+    @staticmethod
+    def _now():
+        return datetime.now().isoformat(timespec='milliseconds')
@@ -1,14 +1,39 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+STARTED_AT = time.perf_counter()
+
+import argparse
 import sys
 import tkinter as tk
 from gui import SpellCheckerGUI
+from instrumentation import Instrumentation
+IMPORT_SECONDS = time.perf_counter() - STARTED_AT
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Correcteur orthographique")
+    parser.add_argument('--trace', metavar='FICHIER',
+                        help="Relève la durée de chaque phase et l'ajoute au fichier (une ligne JSON par vérification)")
+    parser.add_argument('--profil', action='store_true',
+                        help="Profile chaque vérification avec cProfile (fichiers .prof à côté de la trace)")
+    parser.add_argument('--memoire', action='store_true',
+                        help="Suit la mémoire de chaque vérification avec tracemalloc (pic et allocations dans la trace)")
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_arguments()
+    instrumentation = Instrumentation(args.trace, args.profil, args.memoire)
     try:
+        # Durées des phases du démarrage, affichées par l'interface une fois les dictionnaires chargés
+        startup_timings = {'import': IMPORT_SECONDS}
+        start_time = time.perf_counter()
         root = tk.Tk()
-        app = SpellCheckerGUI(root)
+        startup_timings['initialisation Tk'] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        app = SpellCheckerGUI(root, startup_timings, STARTED_AT, instrumentation)
+        startup_timings['interface'] = time.perf_counter() - start_time
+        app.startup_timings.update(startup_timings)
         root.mainloop()
     except Exception as e:
         print(f"Une erreur est survenue : {e}", file=sys.stderr)
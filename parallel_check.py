@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from correction_engine import CheckCancelled, CheckResult, check_text
+from dictionary_snapshot import (DictionarySnapshot, PersonalSnapshot, load_managers, personal_snapshot_path,
+                                 SNAPSHOT_FILE)
+
+# En dessous de cette taille (en caractères), la vérification en série est plus rapide
+PARALLEL_MIN_CHARS = 1 << 21
+SHARDS_PER_WORKER = 4  # Plus de morceaux que de processus : les processus rapides en prennent davantage
+
+# Gestionnaires propres à chaque processus de travail (initialisés une seule fois par processus)
+_spell_manager = None
+_dict_manager = None
+_generation = 0  # Génération du dictionnaire personnel chargé (0 : celui de l'instantané)
+
+
+def init_worker(snapshot_file, corrections_file, ignore_file, accent_fold):
+    """Charge le lexique et le dictionnaire personnel depuis l'instantané compilé, projeté en mémoire
+
+    Les deux sont lus directement dans le fichier (lecture seule) : les processus partagent ses pages.
+    """
+    global _spell_manager, _dict_manager
+    _spell_manager, _dict_manager = load_managers(snapshot_file, corrections_file=corrections_file,
+                                                  ignore_file=ignore_file, accent_fold=accent_fold, read_only=True)
+    _spell_manager.sync_dictionary(_dict_manager)
+
+
+def use_dictionary(generation, personal_file):
+    """Remplace le dictionnaire personnel du processus par celui de personal_file, s'il est plus récent"""
+    global _dict_manager, _generation
+    if generation == _generation:
+        return
+    snapshot = PersonalSnapshot.load(personal_file)
+    if snapshot is None:
+        raise RuntimeError(f"Dictionnaire personnel illisible : {personal_file}")
+    _dict_manager = snapshot.create_read_only_dict_manager()
+    _spell_manager.sync_dictionary(_dict_manager)
+    _generation = generation
+
+
+def check_shard(text, generation=0, personal_file=None):
+    """Vérifie un morceau dans un processus de travail, avec la génération donnée du dictionnaire personnel
+
+    Retourne (texte corrigé ou None s'il est inchangé, corrections, erreurs, nb_mots, {niveau: nb_mots}).
+    """
+    use_dictionary(generation, personal_file)
+    result = check_text(text, _spell_manager, _dict_manager)
+    new_text = result.text if result.edits else None
+    return new_text, result.edits, result.errors, result.total_words, dict(_spell_manager.tier_counts)
+
+
+def split_shards(text, shard_count, min_size=1 << 16):
+    """Retourne les bornes [(début, fin)] de shard_count morceaux de taille voisine, coupés après un retour à la ligne
+
+    Comme pour text_stream.iter_text_chunks, aucun mot ni aucune variante du dictionnaire
+    n'est à cheval sur deux morceaux : les vérifier séparément donne le même résultat
+    que vérifier le texte entier. Un texte sans retour à la ligne forme un seul morceau.
+    """
+    size = max(len(text) // max(shard_count, 1), min_size)
+    bounds = []
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + size) + 1 if start + size < len(text) else 0
+        if not end:
+            end = len(text)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+class ParallelChecker:
+    """Vérifie un long document en le découpant en morceaux répartis entre plusieurs processus
+
+    Les processus sont créés au premier appel puis réutilisés. Ils lisent l'instantané
+    compilé des dictionnaires (mis à jour au besoin avant leur démarrage). Si le
+    dictionnaire personnel change ensuite, seul son index en lecture seule est compilé
+    dans un fichier temporaire ; chaque processus le projette en mémoire à sa tâche
+    suivante (voir use_dictionary), sans être recréé.
+    Les résultats sont fusionnés dans l'ordre du document et sont identiques à ceux
+    d'une vérification en série (check_text).
+    """
+    def __init__(self, workers=None, snapshot_file=SNAPSHOT_FILE, corrections_file='mots-corrections.txt',
+                 ignore_file='dictionnaire_ignore.txt', accent_fold=False, min_chars=PARALLEL_MIN_CHARS):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chars = min_chars
+        self.snapshot_file = snapshot_file
+        self.corrections_file = corrections_file
+        self.ignore_file = ignore_file
+        self.accent_fold = accent_fold
+        self.executor = None
+        self.dictionary_version = None  # Version du dictionnaire personnel lue par les processus
+        self.generation = 0
+        self.personal_file = None  # Index compilé de la génération en cours (None : celui de l'instantané)
+        self.lock = threading.Lock()  # Vérifications lancées depuis plusieurs threads
+
+    def worthwhile(self, text):
+        """Indique si le texte est assez long pour que le découpage soit plus rapide qu'une vérification en série"""
+        return self.workers > 1 and len(text) >= self.min_chars
+
+    def _prepare(self, dict_manager):
+        """Démarre les processus au premier appel et leur fournit le dictionnaire personnel courant
+
+        Retourne (executor, génération, fichier de l'index compilé).
+        """
+        if self.executor is None:
+            # Les modifications du dictionnaire sont journalisées sur disque avant d'être appliquées :
+            # l'instantané mis à jour ici contient donc le même dictionnaire que dict_manager
+            DictionarySnapshot.load_or_build(self.snapshot_file, corrections_file=self.corrections_file,
+                                             ignore_file=self.ignore_file, accent_fold=self.accent_fold,
+                                             read_only=True)
+            # Démarrage « spawn » : les processus ne copient pas l'état (threads, Tk) du processus parent
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=init_worker,
+                initargs=(self.snapshot_file, self.corrections_file, self.ignore_file, self.accent_fold))
+            self.dictionary_version = dict_manager.version
+        elif dict_manager.version != self.dictionary_version:
+            # Copies faites sans exécuter de code Python : une modification concurrente
+            # (thread Tk) ne peut pas s'y intercaler
+            version = dict_manager.version
+            corrections = list(dict_manager.corrections_perso)
+            variant_index = dict(dict_manager.variant_index)
+            self.generation += 1
+            personal_file = f"{personal_snapshot_path(self.snapshot_file)}.{os.getpid()}.{self.generation}"
+            PersonalSnapshot.save(personal_file, corrections, variant_index, self.accent_fold,
+                                  generation=self.generation)
+            self._remove_personal_file()
+            self.personal_file = personal_file
+            self.dictionary_version = version
+        return self.executor, self.generation, self.personal_file
+
+    def _remove_personal_file(self):
+        if self.personal_file is not None:
+            try:
+                os.remove(self.personal_file)
+            except OSError:
+                # Encore projeté par un processus (Windows) : laissé sur place
+                pass
+            self.personal_file = None
+
+    def check(self, text, dict_manager, tier_counts=None, progress=None, is_cancelled=None):
+        """Vérifie text et retourne un CheckResult pour le texte entier
+
+        progress(mots_traités, estimation du nombre de mots) est appelé à la fin de chaque morceau ;
+        is_cancelled() est consulté entre deux morceaux (CheckCancelled est alors levée).
+        Le nombre de mots résolus par niveau est ajouté à tier_counts (un Counter), s'il est fourni.
+        """
+        with self.lock:
+            executor, generation, personal_file = self._prepare(dict_manager)
+            shards = split_shards(text, self.workers * SHARDS_PER_WORKER)
+            futures = [executor.submit(check_shard, text[start:end], generation, personal_file)
+                       for start, end in shards]
+        pieces = []
+        edits = []
+        errors = []
+        total_words = 0
+        counts = Counter()
+        growth = 0  # Décalage introduit par les corrections des morceaux précédents
+        try:
+            for (start, end), future in zip(shards, futures):
+                if is_cancelled is not None and is_cancelled():
+                    raise CheckCancelled()
+                new_text, shard_edits, shard_errors, shard_words, shard_counts = future.result()
+                pieces.append(text[start:end] if new_text is None else new_text)
+                edits.extend((start + position, old, new) for position, old, new in shard_edits)
+                output_start = start + growth
+                errors.extend((output_start + error_start, output_start + error_end, word)
+                              for error_start, error_end, word in shard_errors)
+                growth += sum(len(new) - len(old) for _, old, new in shard_edits)
+                total_words += shard_words
+                counts.update(shard_counts)
+                if progress is not None:
+                    progress(total_words, total_words * len(text) // end)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        if tier_counts is not None:
+            tier_counts.update(counts)
+        return CheckResult("".join(pieces), edits, errors, total_words)
+
+    def close(self):
+        """Arrête les processus de travail"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self._remove_personal_file()
+        self.generation = 0
+        self.dictionary_version = None
@@ -0,0 +1,164 @@
+import threading
+import unicodedata
+from collections import deque
+
+
+def _accent_table():
+    """Table de traduction des lettres accentuées vers leur lettre de base (un caractère pour un)"""
+    table = {}
+    for code in range(0xC0, 0x250):
+        decomposed = unicodedata.normalize('NFD', chr(code))
+        if len(decomposed) > 1 and all(unicodedata.combining(char) for char in decomposed[1:]):
+            table[code] = decomposed[0]
+    return table
+
+
+# Les positions sont conservées : str.translate remplace chaque lettre accentuée par une seule lettre
+ACCENT_TABLE = _accent_table()
+
+
+def fold_text(text, fold_accents=False):
+    """Texte en minuscules (et sans accents si fold_accents), de même longueur que text"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Certaines majuscules changent de longueur en minuscules : conserver les positions
+        lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+    if fold_accents:
+        lowered = lowered.translate(ACCENT_TABLE)
+    return lowered
+
+
+class PhraseMatcher:
+    """Automate d'Aho-Corasick pour rechercher toutes les variantes du dictionnaire en une passe
+
+    Les motifs (mots simples, expressions de plusieurs mots, mots composés avec trait
+    d'union) sont en minuscules ; la recherche ignore la casse et ne retient que les
+    occurrences délimitées par des frontières de mots. Avec fold_accents, les motifs sont
+    aussi sans accents et la recherche ignore les accents du texte. Les ajouts et suppressions
+    modifient le trie en place ; les liens d'échec sont recalculés à la recherche suivante.
+    """
+    def __init__(self, patterns=(), fold_accents=False):
+        self.goto = [{}]  # Transitions de chaque état
+        self.fail = [0]  # Lien d'échec de chaque état
+        self.output = [0]  # Longueur du motif se terminant dans l'état (0 si aucun)
+        self.output_link = [0]  # État le plus proche sur la chaîne d'échec qui termine un motif
+        self.patterns = set()
+        self.fold_accents = fold_accents
+        self.needs_links = False
+        self.lock = threading.Lock()
+        for pattern in patterns:
+            self.add(pattern)
+
+    def export_state(self):
+        """Retourne l'état de l'automate (types simples, sérialisables avec marshal)"""
+        with self.lock:
+            if self.needs_links:
+                self._build_links()
+            return {'goto': self.goto, 'fail': self.fail, 'output': self.output,
+                    'output_link': self.output_link, 'patterns': self.patterns,
+                    'fold_accents': self.fold_accents}
+
+    @classmethod
+    def from_state(cls, state):
+        """Recrée un automate à partir de export_state()"""
+        matcher = cls(fold_accents=state['fold_accents'])
+        matcher.goto = state['goto']
+        matcher.fail = state['fail']
+        matcher.output = state['output']
+        matcher.output_link = state['output_link']
+        matcher.patterns = set(state['patterns'])
+        return matcher
+
+    def add(self, pattern):
+        """Ajoute un motif (déjà normalisé en minuscules)"""
+        with self.lock:
+            if not pattern or pattern in self.patterns:
+                return
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(0)
+                    self.output_link.append(0)
+                    self.goto[state][char] = next_state
+                state = next_state
+            self.output[state] = len(pattern)
+            self.patterns.add(pattern)
+            self.needs_links = True
+
+    def remove(self, pattern):
+        """Retire un motif (les états du trie sont conservés)"""
+        with self.lock:
+            if pattern not in self.patterns:
+                return
+            state = 0
+            for char in pattern:
+                state = self.goto[state][char]
+            self.output[state] = 0
+            self.patterns.discard(pattern)
+            self.needs_links = True
+
+    def _build_links(self):
+        """Calcule les liens d'échec et de sortie par un parcours en largeur du trie"""
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            self.output_link[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                link = self.fail[next_state]
+                self.output_link[next_state] = link if self.output[link] else self.output_link[link]
+                queue.append(next_state)
+        self.needs_links = False
+
+    @staticmethod
+    def _is_word_char(char):
+        return char.isalnum()
+
+    def find_all(self, text):
+        """Retourne toutes les occurrences (début, fin) délimitées par des frontières de mots"""
+        lowered = fold_text(text, self.fold_accents)
+        is_word_char = self._is_word_char
+        text_length = len(text)
+        found = []
+        with self.lock:
+            if self.needs_links:
+                self._build_links()
+            goto, fail, output, output_link = self.goto, self.fail, self.output, self.output_link
+            state = 0
+            for position, char in enumerate(lowered):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                if not state:
+                    continue
+                end = position + 1
+                if end < text_length and is_word_char(text[end]):
+                    continue
+                match_state = state if output[state] else output_link[state]
+                while match_state:
+                    start = end - output[match_state]
+                    if start == 0 or not is_word_char(text[start - 1]):
+                        found.append((start, end))
+                    match_state = output_link[match_state]
+        return found
+
+    def find_longest(self, text):
+        """Retourne les occurrences les plus longues, sans chevauchement, de gauche à droite"""
+        selected = []
+        last_end = 0
+        for start, end in sorted(self.find_all(text), key=lambda match: (match[0], -match[1])):
+            if start >= last_end:
+                selected.append((start, end))
+                last_end = end
+        return selected
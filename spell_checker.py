@@ -1,27 +1,177 @@
 from spellchecker import SpellChecker
+from collections import Counter, OrderedDict
+from symspell_index import SymSpellIndex
+from token_table import TokenTable
+import hashlib
 import re
 import string
+import threading
 
 class SpellCheckerManager:
-    def __init__(self, language='fr'):
-        self.spell = SpellChecker(language=language)
+    PERSONAL_FREQUENCY = 10 ** 9  # Les mots du dictionnaire personnel passent en tête des suggestions
+    
+    def __init__(self, language='fr', cache_size=50000, suggestion_backend='pyspellchecker',
+                 symspell_file='index_suggestions.pickle', lexicon=None, ignored_words=None, suggestion_cache=None):
+        self.language = language
+        self._spell = None
+        # Lexique {mot: fréquence} : celui de pyspellchecker, ou un lexique compilé (voir dictionary_snapshot)
+        if lexicon is None:
+            self.lexicon = self.spell.word_frequency.dictionary
+            longest_word_length = self.spell.word_frequency.longest_word_length
+        else:
+            self.lexicon = lexicon
+            longest_word_length = lexicon.longest_word_length
+        self.max_word_length = longest_word_length + 3
+        self.personal_words = set()  # Mots corrects du dictionnaire personnel (normalisés)
+        self.personal_entries = {}  # {mot normalisé: mot correct tel qu'écrit dans le dictionnaire}
+        self.ignored_words = self.load_ignored_words() if ignored_words is None else ignored_words
+        # Nombre de mots résolus par chaque niveau de vérification lors de la dernière passe
+        self.tier_counts = Counter()
+        # Moteur de suggestions : 'pyspellchecker' (candidats générés à la demande) ou 'symspell' (index précalculé)
+        self.suggestion_backend = suggestion_backend
+        self.symspell_file = symspell_file
+        self.symspell = None
+        self.symspell_entries = {}  # Mots du dictionnaire personnel déjà présents dans l'index SymSpell
+        self.symspell_lock = threading.Lock()
+        # Cache LRU des verdicts {mot normalisé: niveau}, conservé d'une vérification à l'autre
+        self.verdict_cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_version = None  # Version des dictionnaires pour laquelle le cache est valable
+        # Cache persistant des suggestions (voir SuggestionCache), sous l'empreinte des dictionnaires
+        self.suggestion_cache = suggestion_cache
+        self._lexicon_signature = getattr(self.lexicon, 'signature', None)
+        self._suggestion_signature = None
         
+    @property
+    def spell(self):
+        """Correcteur pyspellchecker, chargé seulement s'il est utilisé"""
+        if self._spell is None:
+            self._spell = SpellChecker(language=self.language)
+        return self._spell
+        
+    @staticmethod
+    def normalize_word(word):
+        """Retourne la forme normalisée d'un mot (sans ponctuation, en minuscules)"""
+        return word.strip(string.punctuation).lower()
+        
+    @staticmethod
+    def load_ignored_words(filename='dictionnaire_ignore.txt'):
+        """Charge la liste des mots à ignorer"""
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                return {SpellCheckerManager.normalize_word(line.strip()) for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+            
     def check_word(self, word):
         """Vérifie si un mot est correctement orthographié"""
-        # Si le mot contient une apostrophe, on le vérifie en entier
-        if "'" in word:
-            clean_word = word.strip(string.punctuation).lower()
-            return True  # On considère les mots avec apostrophe comme corrects
+        return self.classify_word(word) != 'inconnu'
+        
+    def classify_word(self, word):
+        """Retourne le niveau de vérification qui résout le mot ('inconnu' s'il est mal orthographié)"""
+        clean_word = self.normalize_word(word)
+        tier = self.verdict_cache.get(clean_word)
+        if tier is not None:
+            self.verdict_cache.move_to_end(clean_word)
+            return tier
+        tier = self._compute_tier(clean_word)
+        self.verdict_cache[clean_word] = tier
+        if len(self.verdict_cache) > self.cache_size:
+            self.verdict_cache.popitem(last=False)
+        return tier
+        
+    def _compute_tier(self, clean_word):
+        """Classe un mot normalisé du test le moins coûteux au plus coûteux, sans passer par le cache"""
+        # Les mots avec apostrophe, les mots courts et les nombres sont considérés comme corrects
+        if "'" in clean_word or len(clean_word) <= 2 or clean_word.isdigit():
+            return 'court'
+        if clean_word in self.ignored_words:
+            return 'ignore'
+        if clean_word in self.lexicon:
+            return 'lexique'
+        if clean_word in self.personal_words:
+            return 'perso'
+        # pyspellchecker ne corrige pas les mots plus longs que son plus long mot connu
+        if len(clean_word) > self.max_word_length:
+            return 'long'
+        return 'inconnu'
+        
+    def sync_dictionary(self, dict_manager):
+        """Reprend les mots du dictionnaire personnel et vide le cache des verdicts s'il a changé"""
+        if dict_manager.version != self.cache_version:
+            self.personal_entries = {self.normalize_word(word): word for word in dict_manager.corrections_perso}
+            self.personal_words = set(self.personal_entries)
+            self.clear_cache()
+            self.cache_version = dict_manager.version
+            self._suggestion_signature = None
             
-        clean_word = word.strip(string.punctuation).lower()
-        if len(clean_word) <= 2 or clean_word.isdigit():
-            return True
-        return self.spell.correction(clean_word) == clean_word
+    def clear_cache(self):
+        """Vide le cache des verdicts"""
+        self.verdict_cache.clear()
         
-    def get_suggestions(self, word):
-        """Retourne les suggestions pour un mot mal orthographié"""
+    def format_tier_counts(self):
+        """Retourne un résumé du nombre de mots résolus par niveau"""
+        return ", ".join(f"{tier} {count}" for tier, count in self.tier_counts.most_common())
+        
+    def get_suggestions(self, word, max_suggestions=10):
+        """Retourne les suggestions pour un mot mal orthographié, de la plus probable à la moins probable"""
         clean_word = word.strip(string.punctuation).lower()
-        return self.spell.candidates(clean_word)
+        if self.suggestion_cache is None:
+            return self._compute_suggestions(clean_word, max_suggestions)
+        signature = self.suggestion_signature()
+        suggestions = self.suggestion_cache.get(signature, clean_word, max_suggestions)
+        if suggestions is None:
+            suggestions = self._compute_suggestions(clean_word, max_suggestions)
+            self.suggestion_cache.put(signature, clean_word, max_suggestions, suggestions)
+        return suggestions
+        
+    def _compute_suggestions(self, clean_word, max_suggestions):
+        """Calcule les suggestions d'un mot normalisé avec le moteur choisi"""
+        if self.suggestion_backend == 'symspell':
+            return self.get_symspell_index().lookup(clean_word, max_suggestions)
+        candidates = self.spell.candidates(clean_word) or set()
+        return sorted(candidates, key=lambda candidate: (-self.spell[candidate], candidate))
+        
+    def suggestion_signature(self):
+        """Empreinte du moteur, du lexique et du dictionnaire personnel, sous laquelle les suggestions sont mises en cache"""
+        signature = self._suggestion_signature
+        if signature is None:
+            if self._lexicon_signature is None:
+                # Lexique de pyspellchecker (sans instantané compilé) : empreinte calculée une fois
+                self._lexicon_signature = SymSpellIndex.lexicon_signature(self.lexicon)
+            digest = hashlib.sha1(f"{self.suggestion_backend}\n{self._lexicon_signature}\n".encode('utf-8'))
+            for word in sorted(self.personal_entries.values()):
+                digest.update(f"{word}\n".encode('utf-8'))
+            signature = self._suggestion_signature = digest.hexdigest()
+        return signature
+        
+    def get_symspell_index(self):
+        """Retourne l'index SymSpell (chargé depuis le disque ou construit au premier appel) à jour du dictionnaire personnel"""
+        # Appelée aussi par les threads de préchargement des suggestions
+        with self.symspell_lock:
+            if self.symspell is None:
+                self.symspell = SymSpellIndex.load_or_build(self.symspell_file, self.lexicon,
+                                                            signature=getattr(self.lexicon, 'signature', None))
+            if self.personal_entries is not self.symspell_entries:
+                self._sync_symspell_entries()
+            return self.symspell
+            
+    def _sync_symspell_entries(self):
+        """Reporte les ajouts et retraits du dictionnaire personnel dans l'index SymSpell"""
+        entries = self.personal_entries
+        for key in self.symspell_entries.keys() - entries.keys():
+            # Un mot retiré du dictionnaire personnel retrouve sa fréquence du lexique
+            if key in self.lexicon:
+                self.symspell.add_word(key, self.lexicon[key])
+            else:
+                self.symspell.remove_word(key)
+        for word in entries.values():
+            self.symspell.add_word(word, self.PERSONAL_FREQUENCY)
+        self.symspell_entries = entries
+        
+    def tokenize(self, text):
+        """Découpe un texte en table de mots compacte (positions et identifiants de type, voir TokenTable)"""
+        return TokenTable.from_text(text)
         
     def extract_words(self, text):
         """Extrait les mots d'un texte en conservant la ponctuation pour le remplacement"""
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import threading
+import time
+
+CACHE_FILE = 'cache_suggestions.sqlite'
+
+
+class SuggestionCache:
+    """Cache persistant des suggestions (base SQLite), conservé d'une session à l'autre
+
+    Chaque entrée est rangée sous l'empreinte du lexique et du dictionnaire personnel
+    qui l'ont produite (voir SpellCheckerManager.suggestion_signature) : dès que
+    mots-corrections.txt change, les anciennes entrées ne sont plus lues et partent
+    en premier lors de l'éviction. Au-delà de max_entries, les entrées périmées puis
+    les moins récemment utilisées sont supprimées. La connexion est partagée par les
+    threads (préchargement des suggestions) sous un verrou ; en cas d'erreur SQLite,
+    le cache est désactivé pour la session.
+    """
+    EVICTION_MARGIN = 0.1  # Proportion d'entrées en trop tolérée avant une éviction
+
+    def __init__(self, filename=CACHE_FILE, max_entries=100000):
+        self.filename = filename
+        self.max_entries = max_entries
+        self.connection = None
+        self.entry_count = None
+        self.lock = threading.Lock()
+        self.disabled = False
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        """Ouvre la base au premier accès (dans n'importe quel thread)"""
+        connection = sqlite3.connect(self.filename, timeout=30, check_same_thread=False)
+        # Le cache peut être reconstruit : inutile d'attendre l'écriture physique sur le disque
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute("""CREATE TABLE IF NOT EXISTS suggestions (
+                                  signature TEXT NOT NULL,
+                                  mot TEXT NOT NULL,
+                                  limite INTEGER NOT NULL,
+                                  suggestions TEXT NOT NULL,
+                                  utilisation REAL NOT NULL,
+                                  PRIMARY KEY (signature, mot, limite))""")
+        connection.execute("CREATE INDEX IF NOT EXISTS suggestions_utilisation ON suggestions (utilisation)")
+        connection.commit()
+        self.entry_count = connection.execute("SELECT COUNT(*) FROM suggestions").fetchone()[0]
+        self.connection = connection
+
+    def _execute(self, action):
+        """Exécute action(connexion) sous le verrou ; retourne None si le cache est inutilisable"""
+        with self.lock:
+            if self.disabled:
+                return None
+            try:
+                if self.connection is None:
+                    self._connect()
+                return action(self.connection)
+            except sqlite3.Error as e:
+                print(f"Cache des suggestions désactivé ({self.filename}) : {e}")
+                self.disabled = True
+                return None
+
+    def get(self, signature, word, max_suggestions):
+        """Retourne les suggestions enregistrées d'un mot normalisé, ou None"""
+        def read(connection):
+            row = connection.execute("SELECT suggestions FROM suggestions WHERE signature = ? AND mot = ? AND limite = ?",
+                                     (signature, word, max_suggestions)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE suggestions SET utilisation = ? WHERE signature = ? AND mot = ? AND limite = ?",
+                               (time.time(), signature, word, max_suggestions))
+            connection.commit()
+            return json.loads(row[0])
+        suggestions = self._execute(read)
+        if suggestions is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return suggestions
+
+    def put(self, signature, word, max_suggestions, suggestions):
+        """Enregistre les suggestions d'un mot normalisé"""
+        def write(connection):
+            connection.execute("INSERT OR REPLACE INTO suggestions VALUES (?, ?, ?, ?, ?)",
+                               (signature, word, max_suggestions,
+                                json.dumps(suggestions, ensure_ascii=False), time.time()))
+            # Décompte approché (un remplacement compte comme un ajout), corrigé lors de l'éviction
+            self.entry_count += 1
+            if self.entry_count > self.max_entries * (1 + self.EVICTION_MARGIN):
+                self._evict(connection, signature)
+            connection.commit()
+        self._execute(write)
+
+    def _evict(self, connection, signature):
+        """Ramène le cache à max_entries entrées : périmées d'abord, puis les moins récemment utilisées"""
+        count = connection.execute("SELECT COUNT(*) FROM suggestions").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            connection.execute("""DELETE FROM suggestions WHERE rowid IN (
+                                      SELECT rowid FROM suggestions
+                                      ORDER BY signature = ?, utilisation LIMIT ?)""", (signature, excess))
+        self.entry_count = min(count, self.max_entries)
+
+    def close(self):
+        """Ferme la base"""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
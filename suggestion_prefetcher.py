@@ -0,0 +1,89 @@
+import heapq
+import itertools
+import threading
+
+
+class SuggestionPrefetcher:
+    """Calcule à l'avance les suggestions des mots de la liste des erreurs, dans un petit groupe de threads
+
+    Les résultats sont conservés dans un cache propre à une vérification : une nouvelle
+    vérification crée un nouveau préchargeur et annule le précédent. Les mots demandés
+    avec prioritize (lignes visibles de la liste) passent devant les autres.
+    """
+    def __init__(self, spell_manager, max_suggestions=10, workers=2):
+        self.spell_manager = spell_manager
+        self.max_suggestions = max_suggestions
+        self.cache = {}  # {mot: suggestions}
+        self.in_progress = set()  # Mots en cours de calcul par un thread
+        self.pending = []  # Tas de (priorité, ordre, mot)
+        self.order = itertools.count()
+        self.generation = 0  # Chaque appel à prioritize passe devant les précédents
+        self.condition = threading.Condition()
+        self.cancelled = False
+        self.threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+
+    def start(self):
+        """Démarre les threads de calcul"""
+        for thread in self.threads:
+            thread.start()
+
+    def cancel(self):
+        """Abandonne les calculs en attente (les calculs en cours se terminent sans être attendus)"""
+        with self.condition:
+            self.cancelled = True
+            self.pending.clear()
+            self.condition.notify_all()
+
+    def submit(self, words):
+        """Ajoute des mots à calculer, dans l'ordre donné, après les mots prioritaires"""
+        self._push(words, 0)
+
+    def prioritize(self, words):
+        """Fait passer des mots (par exemple les lignes visibles) devant tous les autres"""
+        self.generation += 1
+        self._push(words, -self.generation)
+
+    def _push(self, words, priority):
+        with self.condition:
+            if self.cancelled:
+                return
+            for word in words:
+                if word not in self.cache and word not in self.in_progress:
+                    heapq.heappush(self.pending, (priority, next(self.order), word))
+            self.condition.notify_all()
+
+    def get(self, word):
+        """Retourne les suggestions d'un mot : depuis le cache, en attendant le thread qui les calcule,
+        ou en les calculant directement"""
+        with self.condition:
+            while word in self.in_progress and not self.cancelled:
+                self.condition.wait()
+            if word in self.cache:
+                return self.cache[word]
+        suggestions = self.spell_manager.get_suggestions(word, self.max_suggestions)
+        with self.condition:
+            self.cache[word] = suggestions
+        return suggestions
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.cancelled:
+                    self.condition.wait()
+                if self.cancelled:
+                    return
+                _, _, word = heapq.heappop(self.pending)
+                # Un mot peut figurer plusieurs fois dans le tas (soumis puis rendu prioritaire)
+                if word in self.cache or word in self.in_progress:
+                    continue
+                self.in_progress.add(word)
+            try:
+                suggestions = self.spell_manager.get_suggestions(word, self.max_suggestions)
+            except Exception as e:
+                print(f"Erreur lors du calcul des suggestions de '{word}' : {e}")
+                suggestions = None
+            with self.condition:
+                self.in_progress.discard(word)
+                if suggestions is not None:
+                    self.cache[word] = suggestions
+                self.condition.notify_all()
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+def damerau_levenshtein(a, b, max_distance):
+    """Distance de Damerau-Levenshtein (transpositions adjacentes), arrêtée au-delà de max_distance"""
+    if a == b:
+        return 0
+    # Le préfixe et le suffixe communs n'influent pas sur la distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return max(len_a, len_b)
+    if abs(len_a - len_b) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len_b + 1))
+    for i in range(1, len_a + 1):
+        current = [i] + [0] * len_b
+        row_min = i
+        for j in range(1, len_b + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[len_b]
+
+
+class SymSpellIndex:
+    """Index de suppressions symétriques (algorithme SymSpell) pour des suggestions rapides
+
+    Chaque mot du lexique est indexé sous toutes les chaînes obtenues en supprimant
+    jusqu'à max_distance caractères de son préfixe. À la recherche, on ne génère que
+    les suppressions du mot inconnu, puis on vérifie la distance des candidats trouvés.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = {}  # {mot en minuscules: (forme affichée, fréquence)}
+        self.deletes = {}  # {suppression: mots en minuscules séparés par des retours à la ligne}
+        self.signature = None  # Empreinte du lexique indexé
+        self.longest_word_length = 0
+
+    @staticmethod
+    def lexicon_signature(frequencies):
+        """Calcule l'empreinte d'un lexique {mot: fréquence}"""
+        digest = hashlib.sha1()
+        for word in sorted(frequencies):
+            digest.update(f"{word}\t{frequencies[word]}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def build(self, frequencies, signature=None):
+        """Construit l'index à partir d'un lexique {mot: fréquence}"""
+        self.words = {}
+        self.deletes = {}
+        for word, frequency in frequencies.items():
+            self.add_word(word, frequency)
+        self.signature = signature or self.lexicon_signature(frequencies)
+
+    def _prefix_deletes(self, word):
+        """Retourne le préfixe du mot et toutes ses suppressions jusqu'à max_distance"""
+        prefix = word[:self.prefix_length]
+        result = {prefix}
+        frontier = [prefix]
+        for _ in range(self.max_distance):
+            next_frontier = []
+            for candidate in frontier:
+                if len(candidate) <= 1:
+                    continue
+                for i in range(len(candidate)):
+                    delete = candidate[:i] + candidate[i + 1:]
+                    if delete not in result:
+                        result.add(delete)
+                        next_frontier.append(delete)
+            frontier = next_frontier
+        return result
+
+    def add_word(self, word, frequency, display=None):
+        """Ajoute un mot à l'index (ou met à jour sa fréquence)"""
+        key = word.lower()
+        if key not in self.words:
+            for delete in self._prefix_deletes(key):
+                bucket = self.deletes.get(delete)
+                self.deletes[delete] = f"{bucket}\n{key}" if bucket else key
+            self.longest_word_length = max(self.longest_word_length, len(key))
+        self.words[key] = (display or word, frequency)
+
+    def remove_word(self, word):
+        """Retire un mot de l'index"""
+        key = word.lower()
+        if key not in self.words:
+            return
+        del self.words[key]
+        for delete in self._prefix_deletes(key):
+            bucket = self.deletes.get(delete)
+            if bucket is None:
+                continue
+            remaining = [candidate for candidate in bucket.split("\n") if candidate != key]
+            if remaining:
+                self.deletes[delete] = "\n".join(remaining)
+            else:
+                del self.deletes[delete]
+
+    def lookup(self, word, max_suggestions=10):
+        """Retourne les suggestions triées par distance puis par fréquence décroissante"""
+        key = word.lower()
+        if len(key) - self.max_distance > self.longest_word_length:
+            return []
+        found = {}
+        for delete in self._prefix_deletes(key):
+            bucket = self.deletes.get(delete)
+            if bucket is None:
+                continue
+            for candidate in bucket.split("\n"):
+                if candidate in found or abs(len(candidate) - len(key)) > self.max_distance:
+                    continue
+                found[candidate] = damerau_levenshtein(key, candidate, self.max_distance)
+        ranked = sorted(
+            (distance, -self.words[candidate][1], candidate)
+            for candidate, distance in found.items()
+            if distance <= self.max_distance
+        )
+        return [self.words[candidate][0] for _, _, candidate in ranked[:max_suggestions]]
+
+    def save(self, filename):
+        """Enregistre l'index sur disque (écriture atomique)
+
+        Le fichier temporaire est propre à l'appelant : plusieurs processus peuvent enregistrer l'index en même temps.
+        """
+        directory, name = os.path.split(filename)
+        fd, temp_filename = tempfile.mkstemp(dir=directory or '.', prefix=f".{name}.", suffix='.tmp')
+        try:
+            with open(fd, 'wb') as f:
+                pickle.dump((self.FORMAT_VERSION, self.max_distance, self.prefix_length, self.signature,
+                             self.words, self.deletes), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            try:
+                os.unlink(temp_filename)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, filename, signature, max_distance=2, prefix_length=7):
+        """Charge un index enregistré s'il correspond au lexique et aux paramètres, sinon retourne None"""
+        try:
+            with open(filename, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if data[:4] != (cls.FORMAT_VERSION, max_distance, prefix_length, signature):
+            return None
+        index = cls(max_distance, prefix_length)
+        index.signature = signature
+        index.words, index.deletes = data[4], data[5]
+        index.longest_word_length = max((len(word) for word in index.words), default=0)
+        return index
+
+    @classmethod
+    def load_or_build(cls, filename, frequencies, max_distance=2, prefix_length=7, signature=None):
+        """Charge l'index enregistré ou le reconstruit (puis l'enregistre) si le lexique a changé
+
+        signature identifie le lexique ; elle est calculée à partir de son contenu si elle n'est pas fournie.
+        """
+        signature = signature or cls.lexicon_signature(frequencies)
+        index = cls.load(filename, signature, max_distance, prefix_length)
+        if index is None:
+            index = cls(max_distance, prefix_length)
+            index.build(frequencies, signature)
+            try:
+                index.save(filename)
+            except OSError:
+                pass
+        return index
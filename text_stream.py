@@ -0,0 +1,39 @@
+CHUNK_SIZE = 1 << 18  # Taille approximative d'un morceau, en caractères
+
+
+def reformat_sentences(text):
+    """Ajoute des retours à la ligne après chaque point (mise en forme des transcriptions à l'ouverture)"""
+    text = text.replace(". ", ".\n\n")
+    return text.replace(".\n", ".\n\n")  # Pour gérer les points déjà suivis d'un retour
+
+
+def find_cut(text, max_line_length):
+    """Retourne la position où couper un morceau : après le dernier retour à la ligne, ou,
+    si la ligne dépasse max_line_length, après le dernier espace ; 0 pour attendre la suite"""
+    position = text.rfind("\n")
+    if position == -1 and len(text) > max_line_length:
+        position = max(text.rfind(" "), text.rfind("\t"))
+    return position + 1
+
+
+def iter_text_chunks(f, chunk_size=CHUNK_SIZE, reformat=False):
+    """Lit un fichier texte ouvert par morceaux d'environ chunk_size caractères
+
+    Les morceaux sont coupés après un retour à la ligne : aucun mot, aucune variante
+    du dictionnaire personnel et aucune fin de phrase (". ", ".\\n") n'est à cheval sur
+    deux morceaux, si bien que les traiter un par un donne le même résultat que traiter
+    le texte entier. Seule une ligne de plus de quatre morceaux est coupée, après un espace.
+    """
+    carry = ""  # Fin du bloc précédent, après la dernière coupure
+    while True:
+        block = f.read(chunk_size)
+        if not block:
+            break
+        text = carry + block
+        cut = find_cut(text, 4 * chunk_size)
+        carry = text[cut:]
+        if cut:
+            chunk = text[:cut]
+            yield reformat_sentences(chunk) if reformat else chunk
+    if carry:
+        yield reformat_sentences(carry) if reformat else carry
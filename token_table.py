@@ -0,0 +1,48 @@
+import re
+from array import array
+
+# Mots, avec une apostrophe interne éventuelle (l'expression de SpellCheckerManager.extract_words, sans la ponctuation qui suit)
+WORD_PATTERN = re.compile(r"\b[a-zA-ZÀ-ÿ]+(?:'[a-zA-ZÀ-ÿ]+)?")
+
+
+class TokenTable:
+    """Mots d'un texte rangés en colonnes : début, fin et identifiant de type (mot distinct)
+
+    Chaque mot coûte 12 octets (trois entiers non signés) au lieu d'un objet Match ;
+    les chaînes ne sont conservées qu'une fois par mot distinct.
+    """
+    def __init__(self):
+        self.starts = array('I')
+        self.ends = array('I')
+        self.types = array('I')  # Identifiant du mot distinct (indice dans self.words)
+        self.words = []  # Mots distincts, dans l'ordre de première apparition
+        self.type_ids = {}  # {mot: identifiant}
+
+    @classmethod
+    def from_text(cls, text, pattern=WORD_PATTERN):
+        """Découpe un texte en mots"""
+        table = cls()
+        starts, ends, types = table.starts, table.ends, table.types
+        words, type_ids = table.words, table.type_ids
+        for match in pattern.finditer(text):
+            word = match.group()
+            type_id = type_ids.get(word)
+            if type_id is None:
+                type_id = type_ids[word] = len(words)
+                words.append(word)
+            start, end = match.span()
+            starts.append(start)
+            ends.append(end)
+            types.append(type_id)
+        return table
+
+    def __len__(self):
+        return len(self.starts)
+
+    def word(self, index):
+        """Retourne le mot d'indice index"""
+        return self.words[self.types[index]]
+
+    def span(self, index):
+        """Retourne (début, fin) du mot d'indice index"""
+        return self.starts[index], self.ends[index]